@@ -1,10 +1,18 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 import os
 import json
+import logging
+import logging.handlers
+import queue
 import traceback
 import re
 import sys
-from threading import Thread
+import hashlib
+import functools
+from types import MappingProxyType
+import textwrap
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FuturesTimeout, as_completed
 from dotenv import load_dotenv
 import random
 
@@ -15,12 +23,71 @@ if hasattr(sys.stderr, 'reconfigure'):
     sys.stderr.reconfigure(encoding='utf-8')
 
 # 환경 변수 설정 (한글 지원)
-os.environ['PYTHONIOENCODING'] = 'utf-8'
+os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
 app = Flask(__name__)
+# 지역 추출 경로의 진단 출력용 로거 - 레벨로 게이트되어 운영 환경에서는 포맷 비용을 내지 않음
+logger = logging.getLogger(__name__)
+
+# 콘솔 인코딩이 utf-8이 아닐 때의 UnicodeEncodeError를 원천 차단하고,
+# 검색 경로의 진단 출력을 버퍼링되는 하나의 핸들러로 모은다
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+if not logger.handlers:
+    _stream_handler = logging.StreamHandler(sys.stdout)
+    _stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    # 요청 스레드는 큐에 레코드만 넣고 실제 stdout 쓰기는 리스너 스레드가 수행
+    _log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+    _log_listener.start()
+    logger.setLevel(logging.INFO)
+    # gunicorn preload_app 환경에서는 마스터에서 시작한 리스너 스레드가
+    # fork된 워커로 살아남지 않아 큐만 쌓이므로, 워커마다 리스너를 다시 시작한다
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_log_listener.start)
+
+# 검색 결과별 상세 덤프는 비용이 커서(히트당 프린트 7회) 환경 변수로 켤 때만 수행
+_PINECONE_DEBUG = os.getenv("FLASK_PINECONE_DEBUG", "0") == "1"
+
+# retrieve→rerank 오버샘플링 계수. 검색 깊이를 호출자의 top_k 대신
+# rerank_top_n × RERANK × MULTIVEC 로 유도한다 (기본 8×4×4=128, 상한 160).
+_RERANK_OVERSAMPLE = int(os.getenv("PINECONE_RERANK_OVERSAMPLE", "4"))
+_MULTIVEC_OVERSAMPLE = int(os.getenv("PINECONE_MULTIVEC_OVERSAMPLE", "4"))
+_TOP_K_CAP = int(os.getenv("PINECONE_TOP_K_CAP", "160"))
+
+# bge-reranker-v2-m3의 쿼리+문서 쌍 토큰 제한과 색인 chunk_text의 보수적 상한
+_BGE_RERANK_TOKEN_LIMIT = 1024
+_AVG_CHUNK_TOKENS = 400
+
+
+def _approx_tokens(text):
+    """한국어 텍스트의 대략적인 토큰 수 근사 (글자 2개당 1토큰 수준의 보수적 추정)."""
+    return len(text) // 2
+
+# 지역 추출 캐시에서 "찾지 못함"도 결과로 기억하기 위한 표식 (실패가 가장 비싼 경로이므로)
+_DISTRICT_NOT_FOUND = object()
+
+
+# 독립적인 LLM/검색 호출을 병렬로 실행하기 위한 공용 스레드 풀
+_LLM_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm")
+
+# 투기적 네임스페이스 검색 전용 풀. search_pinecone은 내부에서 _LLM_EXECUTOR에
+# 하위 작업을 제출하고 기다리므로, 같은 풀에서 돌리면 바깥 작업들이 슬롯을 전부
+# 차지한 채 안쪽 작업이 스케줄되기만 기다리는 교착이 생길 수 있다
+_SPECULATIVE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="spec")
+
+# /explore multi-query 전용 풀. process_query도 _LLM_EXECUTOR에 하위 작업을
+# 제출하고 합류하므로 같은 풀에서 돌리면 위와 동일한 중첩 대기 교착이 생긴다
+# (/explore는 제한 시간 후 작업을 버리고 떠나므로 부하 시 작업이 쌓이기도 함)
+_EXPLORE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="explore")
+
+# 풀이 포화되어도 요청이 무한정 매달리지 않도록 하는 내부 합류 시한(초)
+_NEIGHBOR_LLM_TIMEOUT = float(os.getenv("NEIGHBOR_LLM_TIMEOUT", "10"))
+_QUERY_INFLIGHT_TIMEOUT = float(os.getenv("QUERY_INFLIGHT_TIMEOUT", "30"))
 
 # Pinecone API 키
 pinecone_api_key = os.getenv("PINECONE_API_KEY")
@@ -49,9 +116,135 @@ except Exception as e:
     print(f"Pinecone 초기화 중 오류: {str(e)}")
     pc = None
 
+try:
+    import orjson
+except ImportError:
+    print("orjson 라이브러리를 찾을 수 없습니다. 대용량 응답 스트리밍을 사용하지 않습니다.")
+    orjson = None
+
+# jsonify 직렬화를 Flask 기본 json.dumps 대신 orjson(C 구현)으로 수행
+# 한글 위주의 큰 히트 응답에서 인코딩이 CPU 병목이므로 효과가 크다
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+else:
+    # orjson이 없을 때도 들여쓰기/키 정렬 비용은 내지 않는다
+    app.json.compact = True
+    app.json.sort_keys = False
+
+
+def _json(payload, status=200):
+    """
+    payload를 orjson으로 직렬화해 Response를 직접 만듭니다.
+    jsonify의 공급자/래핑 경로를 생략하므로 큰 히트 응답에서 더 빠릅니다.
+    """
+    if orjson is not None:
+        # direct_passthrough: 이미 완성된 바이트이므로 WSGI가 본문을 순회/변환하지 않음
+        return Response(
+            orjson.dumps(payload), status=status,
+            mimetype="application/json", direct_passthrough=True,
+        )
+    response = jsonify(payload)
+    response.status_code = status
+    return response
+
+def _first_json(text):
+    """
+    텍스트에서 첫 번째 완전한 JSON 오브젝트 문자열을 추출합니다.
+    중괄호 깊이를 추적하므로 중첩 오브젝트가 있어도 올바르게 잘라냅니다.
+    찾지 못하면 None을 반환합니다.
+    """
+    depth = 0
+    start = -1
+    for i, ch in enumerate(text):
+        if ch == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == '}' and depth > 0:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _loads_json(text):
+    """
+    JSON 문자열을 파싱합니다. orjson이 있으면 orjson(C 구현)을 사용합니다.
+    orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스이므로
+    기존 except 절이 그대로 동작합니다.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# /query 응답 캐시 (동일 질문 반복 요청 시 Pinecone/Gemini 호출 없이 즉시 응답)
+try:
+    from cachetools import TTLCache
+    _QUERY_CACHE = TTLCache(maxsize=10_000, ttl=600)
+    # /explore가 재사용하는 process_query 결과 캐시 (생성 질문은 키당 5개로 순환함)
+    _EXPLORE_QUERY_CACHE = TTLCache(maxsize=1024, ttl=300)
+except ImportError:
+    print("cachetools 라이브러리를 찾을 수 없습니다. /query 응답 캐시를 사용하지 않습니다.")
+    TTLCache = None
+    _QUERY_CACHE = None
+    _EXPLORE_QUERY_CACHE = None
+
+# cachetools의 TTLCache는 스레드 안전하지 않아 요청 스레드와 실행기 스레드가
+# 동시에 읽고 쓰면 만료 처리 중 내부 연결 리스트가 깨질 수 있으므로,
+# 모든 캐시 접근을 하나의 짧은 잠금으로 감싼다
+_CACHE_LOCK = Lock()
+
+
+def _cache_get(cache, key):
+    """잠금으로 보호된 TTLCache 조회. 캐시가 없거나 키가 없으면 None을 반환합니다."""
+    if cache is None:
+        return None
+    with _CACHE_LOCK:
+        return cache.get(key)
+
+
+def _cache_put(cache, key, value):
+    """잠금으로 보호된 TTLCache 저장. 캐시가 없으면 무시합니다."""
+    if cache is not None:
+        with _CACHE_LOCK:
+            cache[key] = value
+
+# 응급안전안심 핸들러는 요청마다 import/생성하지 않고 시작 시 한 번만 만든다
+# (핸들러가 내부에 커넥션 풀 세션을 갖고 있어 재사용해야 핸드셰이크가 절약됨)
+try:
+    from emergency_contact import EmergencyServiceHandler
+    _emergency_handler = EmergencyServiceHandler()
+except ImportError:
+    print("emergency_contact 모듈을 찾을 수 없습니다. 응급안전안심 검색을 사용하지 않습니다.")
+    _emergency_handler = None
+
 try:
     from google import genai
-    gemini_client = genai.Client(api_key=gemini_api_key)
+    from google.genai import types as genai_types
+    import httpx
+
+    # Gemini 호출마다 TCP/TLS 연결을 새로 맺지 않도록 keep-alive 연결 풀을 설정
+    _GEMINI_HTTP_LIMITS = httpx.Limits(
+        max_keepalive_connections=20,
+        max_connections=100,
+        keepalive_expiry=30.0
+    )
+    gemini_client = genai.Client(
+        api_key=gemini_api_key,
+        http_options=genai_types.HttpOptions(
+            client_args={"limits": _GEMINI_HTTP_LIMITS},
+            async_client_args={"limits": _GEMINI_HTTP_LIMITS}
+        )
+    )
     print("Gemini 클라이언트 초기화 성공")
 except ImportError:
     print("Google Generative AI 라이브러리를 찾을 수 없습니다. pip install google-generative-ai로 설치하세요.")
@@ -60,8 +253,8 @@ except Exception as e:
     print(f"Gemini 초기화 중 오류: {str(e)}")
     gemini_client = None
 
-# Namespace 정보
-NAMESPACE_INFO = {
+# Namespace 정보 (읽기 전용 - MappingProxyType으로 실수로 인한 변경 방지)
+NAMESPACE_INFO = MappingProxyType({
     'seoul_job': '서울특별시 고용 정보, 채용 공고, 일자리 관련 데이터',
     'seoul_culture': '서울특별시 문화, 교육, 여가, 평생학습 프로그램 관련 데이터 (세무, 경제, 금융, 컴퓨터, 스마트폰, 건강, 요리, 미술, 음악, 체육, 언어 등 모든 교육 프로그램 포함)', 
     'seoul_facility': '서울특별시 장기요양기관, 방문요양센터, 복지관, 경로당, 노인교실 관련 데이터',
@@ -79,10 +272,10 @@ NAMESPACE_INFO = {
     'kb_facility': '경상북도 장기요양기관, 방문요양센터, 복지관, 경로당, 노인교실 관련 데이터',
     'public_health_center' : '서울특별시 보건소, 인천광역시 보건소, 경기도 보건소',
     "workout" : '증상별, 부위별 운동 추천'
-}
+})
 
 # 서울시 행정구역 간 인접 정보 (각 구와 인접한 구 목록)
-SEOUL_DISTRICT_NEIGHBORS = {
+SEOUL_DISTRICT_NEIGHBORS = MappingProxyType({
     '강남구': ['서초구', '송파구', '강동구', '성동구', '용산구'],
     '강동구': ['송파구', '강남구', '광진구', '성동구'],
     '강북구': ['도봉구', '노원구', '성북구', '중랑구'],
@@ -108,10 +301,10 @@ SEOUL_DISTRICT_NEIGHBORS = {
     '종로구': ['은평구', '서대문구', '중구', '성동구', '동대문구', '성북구'],
     '중구': ['종로구', '서대문구', '용산구', '성동구', '동대문구'],
     '중랑구': ['노원구', '광진구', '동대문구', '성북구', '강북구']
-}
+})
 
 # 경기도 시·군 간 인접 정보 (각 시·군과 인접한 시·군 목록)
-GYEONGGI_DISTRICT_NEIGHBORS = {
+GYEONGGI_DISTRICT_NEIGHBORS = MappingProxyType({
     # 북부 지역
     '연천군': ['포천시', '철원군', '파주시'],
     '포천시': ['연천군', '가평군', '남양주시', '의정부시', '동두천시', '철원군'],
@@ -154,10 +347,10 @@ GYEONGGI_DISTRICT_NEIGHBORS = {
     '평택시': ['화성시', '오산시', '안성시', '아산시', '천안시'],
     '안성시': ['용인시', '화성시', '평택시', '이천시', '천안시', '음성군'],
     '이천시': ['광주시', '여주시', '용인시', '안성시', '충주시', '음성군'],
-}
+})
 
 # 인천시 행정구역 간 인접 정보 (각 구와 인접한 구 목록)
-ICH_DISTRICT_NEIGHBORS = {
+ICH_DISTRICT_NEIGHBORS = MappingProxyType({
     '중구': ['동구', '미추홀구', '서구'],
     '동구': ['중구', '미추홀구'],
     '미추홀구': ['중구', '동구', '남동구', '부평구', '서구'],
@@ -168,10 +361,10 @@ ICH_DISTRICT_NEIGHBORS = {
     '서구': ['중구', '미추홀구', '부평구', '계양구', '연수구'],
     '강화군': [],  # 섬 지역으로 다른 구와 육로로 인접하지 않음
     '옹진군': []   # 섬 지역으로 다른 구와 육로로 인접하지 않음
-}
+})
 
 # 부산광역시 구·군 간 인접 정보 (각 구·군과 인접한 구·군 목록)
-BUSAN_DISTRICT_NEIGHBORS = {
+BUSAN_DISTRICT_NEIGHBORS = MappingProxyType({
     '중구': ['동구', '서구', '영도구', '부산진구', '남구'],
     '서구': ['중구', '동구', '사하구', '영도구'],
     '동구': ['중구', '서구', '부산진구', '남구'],
@@ -188,10 +381,10 @@ BUSAN_DISTRICT_NEIGHBORS = {
     '수영구': ['남구', '연제구', '해운대구'],
     '사상구': ['부산진구', '북구', '사하구', '강서구'],
     '기장군': ['해운대구', '금정구']
-}
+})
 
 # 경상북도 시·군 간 인접 정보 (각 시·군과 인접한 시·군 목록)
-GYEONGBUK_DISTRICT_NEIGHBORS = {
+GYEONGBUK_DISTRICT_NEIGHBORS = MappingProxyType({
     # 북부 지역
     '포항시': ['경주시', '영덕군', '청송군', '영천시', '울산광역시'],
     '경주시': ['포항시', '영천시', '청도군', '울산광역시', '밀양시'],
@@ -218,8 +411,324 @@ GYEONGBUK_DISTRICT_NEIGHBORS = {
     '봉화군': ['안동시', '영주시', '영양군', '울진군', '태백시', '삼척시'],
     '울진군': ['영양군', '영덕군', '봉화군', '삼척시'],
     '울릉군': []  # 섬 지역으로 다른 시·군과 육로로 인접하지 않음
+})
+
+# 운동 부위 및 목적 키워드 매핑
+WORKOUT_CATEGORY_MAPPINGS = {
+    # 신체 부위
+    '허리': ['허리', '요추', '척추', '등허리', '허리통증'],
+    '어깨': ['어깨', '견갑골', '승모근', '어깨통증'],
+    '목': ['목', '경추', '목통증', '거북목'],
+    '무릎': ['무릎', '슬개골', '무릎통증', '관절'],
+    '발목': ['발목', '발목통증', '족관절'],
+    '손목': ['손목', '손목통증', '수근관'],
+    '엉덩이': ['엉덩이', '둔부', '고관절', '힙'],
+    '복부': ['복부', '뱃살', '복근', '코어'],
+    '팔': ['팔', '이두근', '삼두근', '상완'],
+    '다리': ['다리', '하체', '종아리', '허벅지'],
+    '가슴': ['가슴', '흉근', '대흉근'],
+    '등': ['등', '광배근', '등근육'],
+
+    # 운동 목적
+    '다이어트': ['다이어트', '체중감량', '살빼기', '체지방', '감량'],
+    '근력강화': ['근력', '근육', '강화', '벌크업'],
+    '유연성': ['유연성', '스트레칭', '유연', '스트레치'],
+    '균형': ['균형', '밸런스', '평형'],
+    '재활': ['재활', '회복', '치료', '물리치료'],
+    '자세교정': ['자세', '교정', '체형', '정렬'],
+    '체력': ['체력', '지구력', '스태미나', '심폐'],
+    '통증완화': ['통증', '완화', '진통', '아픔']
 }
 
+# 키워드 → 카테고리 역방향 색인 (매 호출마다 중첩 루프를 돌지 않도록 미리 구성)
+KEYWORD_TO_CATEGORY = {
+    keyword: category
+    for category, keywords in WORKOUT_CATEGORY_MAPPINGS.items()
+    for keyword in keywords
+}
+
+# 전체 운동 키워드를 하나의 교대 패턴으로 컴파일 (한 번의 C 레벨 스캔으로 매칭)
+# 같은 위치에서 긴 키워드가 먼저 매칭되도록 길이 내림차순으로 정렬
+_WORKOUT_KW_RE = re.compile(
+    "|".join(map(re.escape, sorted(KEYWORD_TO_CATEGORY, key=len, reverse=True)))
+)
+
+# YouTube URL에서 비디오 ID를 뽑는 패턴 (watch / embed / youtu.be 형식을 하나로 통합)
+_YOUTUBE_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:[^&]*&)*v=|embed/)|youtu\.be/)([a-zA-Z0-9_-]{11})'
+)
+
+
+@functools.lru_cache(maxsize=16384)
+def _youtube_video_id(url):
+    """URL → 비디오 ID 파싱 결과를 메모이즈합니다. 같은 영상이 쿼리마다 반복되므로 적중률이 높습니다."""
+    match = _YOUTUBE_ID_RE.search(url)
+    return match.group(1) if match else None
+
+# 썸네일 품질별 파일명 접미사 (매 호출마다 dict를 새로 만들지 않도록 모듈 상수로 유지)
+_YOUTUBE_THUMB_SUFFIX = {
+    'maxres': 'maxresdefault',  # 1280x720
+    'hq': 'hqdefault',          # 480x360
+    'mq': 'mqdefault',          # 320x180
+    'sd': 'sddefault',          # 640x480
+    'default': 'default'         # 120x90
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _youtube_thumbnail_url(video_id, quality):
+    """(video_id, quality) 조합에 대한 썸네일 URL을 메모이즈합니다. 순수 함수라 TTL이 필요 없습니다."""
+    quality_suffix = _YOUTUBE_THUMB_SUFFIX.get(quality, 'hqdefault')
+    return f"https://img.youtube.com/vi/{video_id}/{quality_suffix}.jpg"
+
+# 행정구역 패턴을 모듈 수준에서 한 번만 컴파일 (호출마다 re 캐시 조회 비용 제거)
+_RE_GU = re.compile(r'(\w+구)')
+_RE_DONG = re.compile(r'(\w+동)')
+_RE_SIGUN = re.compile(r'(\w+[시군])')
+_RE_GUGUN = re.compile(r'(\w+[구군])')
+
+# 지역명 후보에서 제외할 일반 검색어 - 단어별 이중 루프 대신 한 번의 교대 패턴 매칭
+_RE_EXCLUDE = re.compile(
+    "|".join(map(re.escape, ['일자리', '복지', '프로그램', '문화', '센터', '시설', '병원', '학교', '마트']))
+)
+
+# 지역명 없는 쿼리에서 workout 네임스페이스를 고르는 키워드 - 하나의 교대 패턴으로 스캔
+_WORKOUT_NS_KEYWORDS = frozenset({
+    '운동법', '운동방법', '운동추천', '운동영상', '홈트레이닝',
+    '스트레칭', '요가', '필라테스', '홈트', '운동',
+    '통증', '재활', '물리치료', '자세교정', '코어',
+    '다이어트', '체중감량', '체지방', '근육', '체력',
+    '허리', '어깨', '목', '무릎', '발목', '손목',
+})
+_WORKOUT_NS_RE = re.compile(
+    "|".join(map(re.escape, sorted(_WORKOUT_NS_KEYWORDS, key=len, reverse=True)))
+)
+
+# 날씨 질문 감지 키워드 - LLM 직접 응답 경로에서 프롬프트 선택에 사용
+_WEATHER_KW_RE = re.compile(
+    "|".join(map(re.escape, ["날씨", "기온", "강수", "비", "눈", "미세먼지", "황사", "자외선", "바람", "기상"]))
+)
+
+# 체육 시설 이용료 소득 공제 질문 감지 - 조합별 전방탐색 패턴을 한 번만 컴파일
+_SPORTS_DEDUCTION_KEYWORD_SETS = (
+    ('체육', '시설', '소득', '공제'),
+    ('운동', '시설', '소득', '공제'),
+    ('스포츠', '시설', '소득', '공제'),
+    ('체육', '이용료', '공제'),
+    ('운동', '이용료', '공제'),
+    ('헬스장', '소득', '공제'),
+    ('헬스장', '세금', '공제'),
+    ('체육시설', '세금', '공제'),
+    ('운동', '세금', '공제'),
+    ('피트니스', '소득', '공제'),
+    ('체육시설', '소득공제'),
+    ('운동시설', '소득공제'),
+)
+_SPORTS_DEDUCTION_PATTERNS = tuple(
+    re.compile("".join(f"(?=.*{re.escape(k)})" for k in keyword_set), re.S)
+    for keyword_set in _SPORTS_DEDUCTION_KEYWORD_SETS
+)
+
+# 모든 지역 → 소속 시/도 역방향 색인 (매 호출마다 5개 dict를 다시 합치지 않음)
+# 같은 이름의 구가 여러 도시에 있는 경우(예: 중구) 뒤에 오는 도시가 우선한다
+ALL_DISTRICT_TO_CITY = {
+    **{district: "서울특별시" for district in SEOUL_DISTRICT_NEIGHBORS},
+    **{district: "경기도" for district in GYEONGGI_DISTRICT_NEIGHBORS},
+    **{district: "인천광역시" for district in ICH_DISTRICT_NEIGHBORS},
+    **{district: "부산광역시" for district in BUSAN_DISTRICT_NEIGHBORS},
+    **{district: "경상북도" for district in GYEONGBUK_DISTRICT_NEIGHBORS},
+}
+ALL_DISTRICTS = tuple(ALL_DISTRICT_TO_CITY)
+
+# 시/도 → 소속 구/시/군 목록 역색인 (요청마다 전체 지역을 필터링하지 않음)
+CITY_TO_DISTRICTS = {}
+for _district, _city in ALL_DISTRICT_TO_CITY.items():
+    CITY_TO_DISTRICTS.setdefault(_city, []).append(_district)
+CITY_TO_DISTRICTS = {city: tuple(districts) for city, districts in CITY_TO_DISTRICTS.items()}
+
+# 프롬프트에 반복 삽입되는 지역 목록 문자열을 한 번만 구성 (쿼리마다 join/필터링을 반복하지 않음)
+CITY_DISTRICT_CSV = {city: ", ".join(districts) for city, districts in CITY_TO_DISTRICTS.items()}
+ALL_DISTRICTS_PROMPT_BLOCK = "\n    ".join(
+    f"{city}: {csv}" for city, csv in CITY_DISTRICT_CSV.items()
+)
+
+# O(1) 멤버십 확인용 (리스트 in 검사 대체)
+ALL_DISTRICTS_SET = frozenset(ALL_DISTRICTS)
+
+# 지역별 기본 인기 지역 (대상 지역을 모르거나 인접 정보가 없을 때)
+_REGION_DEFAULT_NEARBY = {
+    "seoul": ('강남구', '서초구', '종로구'),
+    "gyeonggi": ('수원시', '성남시', '고양시'),
+    "incheon": ('남동구', '부평구', '연수구'),
+    "busan": ('해운대구', '부산진구', '남구'),
+    "gyeongbuk": ('포항시', '경주시', '안동시'),
+}
+
+
+def _precompute_nearby(neighbors_map, default):
+    """[district] + neighbors[:3] 결과를 임포트 시점에 튜플로 고정합니다.
+
+    강화군/옹진군/울릉군처럼 인접 지역이 없는 섬 지역은 기본 인기 지역으로 대체합니다.
+    """
+    return {
+        district: (district, *(tuple(neighbors[:3]) or default))
+        for district, neighbors in neighbors_map.items()
+    }
+
+
+# 기본 max_neighbors=3 경로의 리스트 생성/슬라이싱을 요청마다 반복하지 않도록 미리 계산
+_PRECOMPUTED_NEARBY = {
+    "seoul": _precompute_nearby(SEOUL_DISTRICT_NEIGHBORS, _REGION_DEFAULT_NEARBY["seoul"]),
+    "gyeonggi": _precompute_nearby(GYEONGGI_DISTRICT_NEIGHBORS, _REGION_DEFAULT_NEARBY["gyeonggi"]),
+    "incheon": _precompute_nearby(ICH_DISTRICT_NEIGHBORS, _REGION_DEFAULT_NEARBY["incheon"]),
+    "busan": _precompute_nearby(BUSAN_DISTRICT_NEIGHBORS, _REGION_DEFAULT_NEARBY["busan"]),
+    "gyeongbuk": _precompute_nearby(GYEONGBUK_DISTRICT_NEIGHBORS, _REGION_DEFAULT_NEARBY["gyeongbuk"]),
+}
+
+# 지역 키 → 인접 테이블 (공통 구현에서 사용)
+_REGION_NEIGHBORS = {
+    "seoul": SEOUL_DISTRICT_NEIGHBORS,
+    "gyeonggi": GYEONGGI_DISTRICT_NEIGHBORS,
+    "incheon": ICH_DISTRICT_NEIGHBORS,
+    "busan": BUSAN_DISTRICT_NEIGHBORS,
+    "gyeongbuk": GYEONGBUK_DISTRICT_NEIGHBORS,
+}
+
+# 지역 키 → (프롬프트의 행정구역 단위 표기, 이름 단위 표기, 예시 표기, 로그 라벨)
+_REGION_PROMPT_CFG = {
+    "seoul": ("구역", "구", "구이름", "서울 인접 구"),
+    "gyeonggi": ("시·군", "시·군", "시군이름", "경기도 인접 시·군"),
+    "incheon": ("구·군", "구·군", "구군이름", "인천 인접 구·군"),
+    "busan": ("구·군", "구·군", "구군이름", "부산 인접 구·군"),
+    "gyeongbuk": ("시·군", "시·군", "시군이름", "경북 인접 시·군"),
+}
+
+# 네임스페이스 접두어 → 지역 키
+_NS_PREFIX_TO_REGION = {
+    "seoul": "seoul",
+    "kk": "gyeonggi",
+    "ich": "incheon",
+    "bs": "busan",
+    "kb": "gyeongbuk",
+}
+
+# 레거시 도시별 추출기의 프롬프트용 지역 목록 (이웃 테이블 원본 순서 유지)
+_SEOUL_DISTRICT_CSV = ", ".join(SEOUL_DISTRICT_NEIGHBORS)
+_GYEONGGI_DISTRICT_CSV = ", ".join(GYEONGGI_DISTRICT_NEIGHBORS)
+_ICH_DISTRICT_CSV = ", ".join(ICH_DISTRICT_NEIGHBORS)
+
+# 레거시 추출기의 소속 확인용 집합 (호출마다 list()를 만들지 않고 O(1) 멤버십)
+SEOUL_DISTRICTS = frozenset(SEOUL_DISTRICT_NEIGHBORS)
+GYEONGGI_DISTRICTS = frozenset(GYEONGGI_DISTRICT_NEIGHBORS)
+ICH_DISTRICTS = frozenset(ICH_DISTRICT_NEIGHBORS)
+
+# 네임스페이스 접두어 → 소속 시/도 (is_* 메서드 체인 대신 O(1) 조회)
+_NS_PREFIX_TO_CITY = {
+    "seoul": "서울특별시",
+    "kk": "경기도",
+    "ich": "인천광역시",
+    "bs": "부산광역시",
+    "kb": "경상북도",
+}
+
+# 시/도 이름 → 네임스페이스 접두어 역색인 (도시별 if/elif 분기 대신 O(1) 조회)
+_CITY_TO_NS_PREFIX = {city: prefix for prefix, city in _NS_PREFIX_TO_CITY.items()}
+
+
+def city_for_namespace(namespace):
+    """네임스페이스가 속한 시/도 이름을 반환합니다. 지역 네임스페이스가 아니면 None."""
+    if not namespace:
+        return None
+    return _NS_PREFIX_TO_CITY.get(namespace.split("_", 1)[0])
+
+
+# 쿼리에서 도시명을 감지하기 위한 키워드
+CITY_KEYWORDS = {
+    "부산": "부산광역시",
+    "서울": "서울특별시",
+    "인천": "인천광역시",
+    "대구": "대구광역시",
+    "광주": "광주광역시",
+    "대전": "대전광역시",
+    "울산": "울산광역시"
+}
+
+# 주요 동 → (도시, 구/시/군) 정적 색인
+# 프롬프트 예시로 쓰던 대표 동들 - 여기 등록된 동은 LLM 호출 없이 바로 결정
+DONG_TO_DISTRICT = {
+    '역삼동': ('서울특별시', '강남구'),
+    '삼성동': ('서울특별시', '강남구'),
+    '명동': ('서울특별시', '중구'),
+    '신촌동': ('서울특별시', '서대문구'),
+    '지제동': ('경기도', '평택시'),
+    '정자동': ('경기도', '성남시'),
+    '행신동': ('경기도', '고양시'),
+    '송도동': ('인천광역시', '연수구'),
+    '구월동': ('인천광역시', '남동구'),
+    '부평동': ('인천광역시', '부평구'),
+    '해운대동': ('부산광역시', '해운대구'),
+    '서면동': ('부산광역시', '부산진구'),
+    '광안동': ('부산광역시', '수영구'),
+}
+
+# 도시/구/시/군/동 이름을 한 번의 스캔으로 찾기 위한 Aho-Corasick 오토마톤
+try:
+    import ahocorasick
+
+    def _build_district_automaton():
+        automaton = ahocorasick.Automaton()
+        for keyword, city_name in CITY_KEYWORDS.items():
+            automaton.add_word(keyword, ('city', city_name))
+        for dong, (city_name, district) in DONG_TO_DISTRICT.items():
+            automaton.add_word(dong, ('dong', f"{city_name} {district}"))
+        for district, city_name in ALL_DISTRICT_TO_CITY.items():
+            automaton.add_word(district, ('district', f"{city_name} {district}"))
+        automaton.make_automaton()
+        return automaton
+
+    _DISTRICT_AUTOMATON = _build_district_automaton()
+except ImportError:
+    print("pyahocorasick 라이브러리를 찾을 수 없습니다. 지역명 탐지는 단일 교대 패턴을 사용합니다.")
+    _DISTRICT_AUTOMATON = None
+
+if _DISTRICT_AUTOMATON is None:
+    # 폴백: 전체 지역명을 긴 이름 우선으로 정렬한 하나의 교대 패턴으로 컴파일
+    # 지역별 O(N·|query|) 순차 in 검사 대신 정규식 엔진이 쿼리를 한 번만 스캔한다
+    _DISTRICT_MEGA_RE = re.compile(
+        "|".join(map(re.escape, sorted(ALL_DISTRICTS, key=len, reverse=True)))
+    )
+else:
+    _DISTRICT_MEGA_RE = None
+
+# /query 라우팅 키워드 (소득공제 키워드 세트 + 응급안전안심)
+_EMERGENCY_KEYWORDS = ('응급안전안심', '응급안전', '안심서비스', '독거노인안전', '응급호출', '응급 안전 안심')
+_EMERGENCY_KEYWORD_SET = frozenset(_EMERGENCY_KEYWORDS)
+_SPORTS_DEDUCTION_FROZEN_SETS = tuple(frozenset(s) for s in _SPORTS_DEDUCTION_KEYWORD_SETS)
+
+# 라우팅 키워드 전체를 하나의 오토마톤으로 묶어 쿼리를 한 번만 스캔한다
+if _DISTRICT_AUTOMATON is not None:
+    _ROUTER_AUTOMATON = ahocorasick.Automaton()
+    for _kw in {kw for keyword_set in _SPORTS_DEDUCTION_KEYWORD_SETS for kw in keyword_set} | set(_EMERGENCY_KEYWORDS):
+        _ROUTER_AUTOMATON.add_word(_kw, _kw)
+    _ROUTER_AUTOMATON.make_automaton()
+else:
+    _ROUTER_AUTOMATON = None
+
+
+def _route_keyword_flags(query):
+    """
+    (체육시설 소득공제 질문 여부, 응급안전안심 질문 여부)를 반환합니다.
+    오토마톤이 있으면 쿼리를 한 번만 훑고, 없으면 기존 패턴/부분 문자열 검사를 사용합니다.
+    """
+    if _ROUTER_AUTOMATON is not None:
+        matched = {word for _end, word in _ROUTER_AUTOMATON.iter(query)}
+        is_sports = any(keyword_set <= matched for keyword_set in _SPORTS_DEDUCTION_FROZEN_SETS)
+        is_emergency = not matched.isdisjoint(_EMERGENCY_KEYWORD_SET)
+        return is_sports, is_emergency
+    is_sports = any(pattern.search(query) for pattern in _SPORTS_DEDUCTION_PATTERNS)
+    is_emergency = any(keyword in query for keyword in _EMERGENCY_KEYWORDS)
+    return is_sports, is_emergency
+
 # multi_query_category 정의 (파일 상단, NAMESPACE_INFO 아래에 추가)
 MULTI_QUERY_CATEGORY = {
     '문화': '{user_city} {user_district}의 문화 정보',
@@ -236,6 +745,214 @@ MULTI_QUERY_CATEGORY = {
     '식사': '{user_city} {user_district}의 경로식당 및 도시락 배달 서비스'
 }
 
+# 카테고리 키 목록 (매 요청마다 list 생성을 피하기 위해 미리 tuple로 변환)
+_MULTI_QUERY_CATEGORY_KEYS = tuple(MULTI_QUERY_CATEGORY.keys())
+
+# 응답 구성에 반복 사용되는 고정 라벨
+# (한글 리터럴은 CPython이 자동으로 intern하지 않으므로 직접 intern하여 공유)
+_LBL_AI_RESPONSE = sys.intern("AI 응답")
+_LBL_GENERAL_INFO = sys.intern("일반 정보")
+_LBL_NO_RESULT = sys.intern("검색 결과 없음")
+_LBL_SEARCH_ERROR = sys.intern("검색 오류")
+_LBL_ERROR = sys.intern("오류")
+_LBL_NA = sys.intern("N/A")
+
+# /explore 응답에 항상 포함되는 고정 인기 검색어 (요청마다 리스트를 새로 만들지 않음)
+POPULAR_SEARCHES = (
+    "방문요양 서비스",
+    "노인 일자리 채용",
+    "실버 문화강좌",
+    "건강검진 안내",
+    "복지관 프로그램"
+)
+
+# /explore 지역별 추천 검색어 템플릿 ({d}에 구/군명이 채워짐)
+# 경상북도는 도명에 '경북'이 부분 문자열로 들어 있지 않으므로 두 키로 등록한다
+_GYEONGBUK_RECOMMENDATIONS = (
+    "{d} 노인복지시설",
+    "{d} 시니어클럽",
+    "{d} 문화센터",
+    "{d} 일자리지원센터",
+    "{d} 복지관",
+)
+_RECOMMENDATION_TEMPLATES = {
+    "서울": (
+        "{d} 노인복지관",
+        "{d} 경로당",
+        "{d} 시니어 일자리",
+        "{d} 문화센터 프로그램",
+        "{d} 방문요양센터",
+    ),
+    "경기": (
+        "{d} 노인복지시설",
+        "{d} 실버 일자리",
+        "{d} 평생교육원",
+        "{d} 주간보호센터",
+        "{d} 노인교실",
+    ),
+    "인천": (
+        "{d} 노인복지관",
+        "{d} 시니어클럽",
+        "{d} 문화강좌",
+        "{d} 일자리센터",
+        "{d} 경로당",
+    ),
+    "부산": (
+        "{d} 노인복지관",
+        "{d} 시니어센터",
+        "{d} 평생학습관",
+        "{d} 실버일자리",
+        "{d} 경로식당",
+    ),
+    "경북": _GYEONGBUK_RECOMMENDATIONS,
+    "경상북도": _GYEONGBUK_RECOMMENDATIONS,
+}
+_DEFAULT_RECOMMENDATIONS = (
+    "노인복지시설 찾기",
+    "시니어 일자리 정보",
+    "문화 프로그램 안내",
+    "건강 관리 서비스",
+    "여가 활동 정보",
+)
+
+# 응급안전안심 기관 정보 본문 템플릿 (결과마다 f-string을 다시 조립하지 않음)
+_EMERGENCY_CONTENT_TMPL = "기관명: {}\n주소: {}\n전화: {}\n이메일: {}\n"
+
+# /explore multi-query가 이 시간 안에 끝나지 않으면 부분 응답을 먼저 돌려준다
+# (백그라운드 작업은 계속 진행되어 질문/검색 캐시를 덥힌다)
+_EXPLORE_LLM_TIMEOUT = float(os.getenv("EXPLORE_LLM_TIMEOUT", "0.8"))
+
+# 동시에 도착한 동일 /query 요청 병합용 (캐시 키 → 응답 바이트/상태를 담는 Future)
+_QUERY_INFLIGHT = {}
+_QUERY_INFLIGHT_LOCK = Lock()
+
+# /explore 인접 지역 응답용 통합 색인: 다섯 지역 표의 순차 in 검사 대신 조회 한 번
+# 표 순서가 기존 elif 체인의 우선순위이고(중복 지역명은 앞선 표가 우선),
+# 인접 정보가 비어 있는 섬 지역은 해당 지역의 기본 목록으로 대체한다
+_EXPLORE_NEARBY = {}
+for _table, _fallback in (
+    (SEOUL_DISTRICT_NEIGHBORS, None),
+    (GYEONGGI_DISTRICT_NEIGHBORS, None),
+    (ICH_DISTRICT_NEIGHBORS, ('남동구', '부평구', '연수구')),
+    (BUSAN_DISTRICT_NEIGHBORS, None),
+    (GYEONGBUK_DISTRICT_NEIGHBORS, ('포항시', '경주시', '안동시')),
+):
+    for _district, _neighbors in _table.items():
+        if _district in _EXPLORE_NEARBY:
+            continue
+        if not _neighbors and _fallback is not None:
+            _EXPLORE_NEARBY[_district] = list(_fallback)
+        else:
+            _EXPLORE_NEARBY[_district] = list(_neighbors[:3])
+
+
+# Gemini 프롬프트 템플릿 (호출 시마다 긴 f-string을 다시 만들지 않도록 모듈 수준에 정의)
+# 고정 지시문이 앞에 오고 사용자 쿼리가 placeholder로 들어간다
+_NAMESPACE_JSON = json.dumps(dict(NAMESPACE_INFO), indent=2, ensure_ascii=False)
+
+_CHECK_LOCATION_PROMPT = textwrap.dedent("""
+    다음 질문에 한국의 지역명(시/도, 구/군, 동/읍/면 등)이 포함되어 있는지 판단해주세요.
+
+    주의사항:
+    - "운동", "문화", "프로그램" 등은 일반 명사이므로 지역명이 아닙니다
+    - "운동동"처럼 실제 지역명인 경우만 지역명으로 인정합니다
+    - 명확한 지역명이 있을 때만 True로 판단하세요
+
+    ### 응답 형식:
+    JSON 형식으로 응답해주세요.
+    예시: {{"has_location": true, "location": "강북구", "reasoning": "강북구라는 명확한 지역명이 있음"}}
+    예시: {{"has_location": false, "location": null, "reasoning": "지역명이 없고 운동 관련 질문만 있음"}}
+
+    ### 질문:
+    {query}
+    """).strip()
+
+_WORKOUT_CATEGORY_PROMPT = textwrap.dedent("""
+    다음 운동 관련 질문에서 주요 운동 부위나 목적을 추출해주세요.
+
+    가능한 카테고리:
+    신체 부위: 허리, 어깨, 목, 무릎, 발목, 손목, 엉덩이, 복부, 팔, 다리, 가슴, 등
+    운동 목적: 다이어트, 근력강화, 유연성, 균형, 재활, 자세교정, 체력, 통증완화
+
+    위 카테고리 중 하나만 선택해서 답변해주세요. 
+    만약 정확히 일치하는 카테고리가 없다면 가장 관련있는 것을 선택하세요.
+    카테고리 이름만 답변해주세요.
+
+    ### 질문:
+    {query}
+    """).strip()
+
+# select_namespace 결과 캐시 (정규화된 쿼리 해시 → 선택 결과)
+_NS_CACHE = None if TTLCache is None else TTLCache(maxsize=10_000, ttl=3600)
+
+# check_location_in_query 응답을 항상 파싱 가능한 JSON으로 강제하는 생성 설정
+_CHECK_LOCATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type": "object",
+        "properties": {
+            "has_location": {"type": "boolean"},
+            "location": {"type": "string", "nullable": True},
+            "reasoning": {"type": "string"},
+        },
+        "required": ["has_location"],
+    },
+}
+
+# 지역 추출 LLM 호출용 구조화 출력 스키마 - 마크다운/잡담 없이 JSON만 받아 파싱 실패를 줄임
+_DISTRICT_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "city": {"type": "string", "nullable": True},
+        "district": {"type": "string", "nullable": True},
+    },
+}
+
+_DISTRICT_ONLY_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type": "object",
+        "properties": {
+            "district": {"type": "string", "nullable": True},
+        },
+    },
+}
+
+_COMBINED_DISTRICT_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type": "object",
+        "properties": {
+            "from_dong": _DISTRICT_RESULT_SCHEMA,
+            "from_candidates": _DISTRICT_RESULT_SCHEMA,
+            "from_full_query": _DISTRICT_RESULT_SCHEMA,
+        },
+    },
+}
+
+# 인접 구역 선택 호출용 - 항상 문자열 배열만 반환하도록 강제
+_DISTRICT_LIST_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {"type": "array", "items": {"type": "string"}},
+}
+
+_NAMESPACE_PROMPT = textwrap.dedent("""
+    당신은 사용자 질문에 가장 적합한 namespace를 선택하는 시스템입니다. 
+    다음 정보를 참고하여 주어진 질문이 어떤 namespace에 가장 적합한지 판단하세요.
+
+    ### Namespace 정보:
+    {namespace_json}
+
+    ### 응답 형식:
+    JSON 형식으로 응답해 주세요. 가장 적합한 namespace 하나와 그 선택에 대한 confidence score(0.0~1.0)를 제공하세요.
+    예시: {{"namespace": "namespace_key", "confidence": 0.95, "reasoning": "이 namespace를 선택한 이유"}}
+
+    항상 정확히 하나의 namespace만 선택하세요. 어떤 namespace에도 맞지 않는다면 confidence를 0.3 미만으로 설정하고 namespace를 null로 지정하세요.
+
+    ### 사용자 질문:
+    {query}
+    """).strip()
+
 
 class QueryProcessor:
     def __init__(self, gemini_client, pinecone_client, dense_index_name="dense-for-hybrid-py"):
@@ -250,44 +967,205 @@ class QueryProcessor:
         self.gemini_client = gemini_client
         self.pc = pinecone_client
         self.dense_index_name = dense_index_name
-        self.dense_index = None if self.pc is None else self.pc.Index(self.dense_index_name)
+        # pool_threads/connection_pool_maxsize: 동시에 여러 검색을 보낼 때
+        # 워커 수명 동안 TCP+TLS 연결을 재사용하기 위한 스레드/커넥션 풀
+        self.dense_index = None if self.pc is None else self.pc.Index(
+            self.dense_index_name, pool_threads=30, connection_pool_maxsize=30
+        )
+        # 동일 프롬프트로 반복되는 Gemini 호출 결과 캐시 (프롬프트 해시 → 응답 텍스트)
+        self._llm_cache = None if TTLCache is None else TTLCache(maxsize=2048, ttl=600)
+        # 진행 중인 동일 프롬프트 호출 병합용 (프롬프트 해시 → Future)
+        self._inflight = {}
+        self._inflight_lock = Lock()
+        # (쿼리, 네임스페이스) → 추출 결과 캐시 - 반복 쿼리는 전체 단계 캐스케이드를 건너뜀
+        self._district_cache = None if TTLCache is None else TTLCache(maxsize=8192, ttl=600)
+        # (쿼리, 결과 집합) → rerank 순서 캐시 - 동일 결과 집합 재정렬을 건너뜀
+        self._rerank_cache = None if TTLCache is None else TTLCache(maxsize=2048, ttl=300)
+        # 쿼리 → 지역명 유무 판단 / 통합 지역 추출 결과 캐시 (process_query마다 호출됨)
+        self._location_check_cache = None if TTLCache is None else TTLCache(maxsize=4096, ttl=600)
+        self._unified_district_cache = None if TTLCache is None else TTLCache(maxsize=4096, ttl=600)
+        # (namespace, 대상 지역) → 이전 검색의 병합(1+2단계) 결과 캐시
+        # 같은 지역을 다시 묻는 쿼리는 2단계 인접 지역 RPC를 건너뛸 수 있다
+        self._prior_hits_cache = None if TTLCache is None else TTLCache(maxsize=512, ttl=300)
+
+    def _cached_generate_content(self, prompt, model="gemini-2.0-flash-lite", config=None):
+        """
+        Gemini 호출 결과(response.text)를 프롬프트 해시 기준으로 캐시합니다.
+        같은 프롬프트가 반복되면 네트워크 왕복 없이 저장된 텍스트를 반환하고,
+        동일 프롬프트가 이미 네트워크를 타고 있으면 새 호출 대신 그 결과를 공유합니다.
+        """
+        key = None
+        if self._llm_cache is not None:
+            key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+            cached = _cache_get(self._llm_cache, key)
+            if cached is not None:
+                return cached
+
+            # 진행 중인 동일 호출이 있으면 합류 (버스트 시 Gemini QPS를 1/N로 줄임)
+            with self._inflight_lock:
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Future()
+                    self._inflight[key] = future
+                    owner = True
+                else:
+                    owner = False
+            if not owner:
+                return future.result()
+
+            try:
+                response = self.gemini_client.models.generate_content(
+                    model=model,
+                    contents=prompt,
+                    config=config
+                )
+                text = response.text
+                if text:
+                    _cache_put(self._llm_cache, key, text)
+                future.set_result(text)
+                return text
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+
+        response = self.gemini_client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=config
+        )
+        return response.text
+
+    def _trim_fallback_hits(self, response, top_n):
+        """
+        rerank 없이 반환되는 폴백 결과를 rerank와 동일한 개수로 제한합니다.
+        (검색 깊이는 오버샘플링으로 top_k보다 크므로 그대로 반환하면 응답이 비대해짐)
+        """
+        try:
+            hits = response['result']['hits']
+        except (KeyError, TypeError):
+            return response
+        if top_n and len(hits) > top_n:
+            return {"result": {"hits": hits[:top_n]}}
+        return response
+
+    def _search_with_rerank(self, namespace, search_params, fields, rerank):
+        """
+        rerank 포함 검색을 수행하되, rerank 없는 동일 검색을 미리 병렬로 시작해 둡니다.
+        rerank가 토큰 제한으로 실패하면 재시도 왕복 없이 대기 중인 일반 결과를 사용합니다.
+        """
+        # 토큰 제한 초과가 확실한 긴 쿼리는 rerank 시도 자체를 생략 (예외 경로 왕복 제거)
+        query_text = search_params.get("inputs", {}).get("text", "")
+        if _approx_tokens(query_text) + _AVG_CHUNK_TOKENS >= _BGE_RERANK_TOKEN_LIMIT:
+            logger.info("쿼리가 길어 rerank 토큰 제한이 예상됨. 일반 검색만 수행...")
+            plain_result = self.dense_index.search(
+                namespace=namespace,
+                query=search_params,
+                fields=fields
+            )
+            return self._trim_fallback_hits(plain_result, rerank.get("top_n"))
+
+        plain_future = _LLM_EXECUTOR.submit(
+            self.dense_index.search,
+            namespace=namespace,
+            query=search_params,
+            fields=fields
+        )
+        try:
+            result = self.dense_index.search(
+                namespace=namespace,
+                query=search_params,
+                fields=fields,
+                rerank=rerank,
+            )
+            plain_future.cancel()
+            return result
+        except Exception as rerank_error:
+            if "maximum token limit" in str(rerank_error):
+                logger.info("토큰 제한 초과. 병렬로 수행한 rerank 없는 검색 결과 사용...")
+                return self._trim_fallback_hits(plain_future.result(), rerank.get("top_n"))
+            raise
+
+    def _rerank_hits(self, query, hits, top_n):
+        """
+        단계별 검색 결과를 합쳐 bge-reranker로 한 번만 재정렬합니다.
+        검색 호출마다 rerank를 따로 태우는 대신 _id 기준으로 중복을 제거한 뒤
+        일괄 처리하므로 다지역 검색에서 rerank 토큰 비용이 절반으로 줄어듭니다.
+        """
+        if not hits:
+            return hits
+
+        # 1단계/2단계 결과가 겹칠 수 있으므로 _id 기준 중복 제거
+        deduped = []
+        seen = set()
+        for hit in hits:
+            hit_id = hit.get('_id')
+            if hit_id is None or hit_id not in seen:
+                seen.add(hit_id)
+                deduped.append(hit)
+
+        cache_key = None
+        if self._rerank_cache is not None:
+            key_src = "|".join([query, str(top_n)] + sorted(h.get('_id', '') for h in deduped))
+            cache_key = hashlib.blake2b(key_src.encode('utf-8'), digest_size=16).hexdigest()
+            cached = _cache_get(self._rerank_cache, cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            reranked = self.pc.inference.rerank(
+                model="bge-reranker-v2-m3",
+                query=query,
+                documents=[h.get('fields', {}).get('chunk_text', '') for h in deduped],
+                top_n=min(top_n, len(deduped)),
+                return_documents=False,
+            )
+            ordered = []
+            for row in reranked.data:
+                hit = deduped[row.index]
+                hit['_score'] = row.score
+                ordered.append(hit)
+        except Exception as e:
+            logger.warning("rerank 실패, 원본 순서 사용: %s", e)
+            ordered = deduped[:top_n]
+
+        if cache_key is not None:
+            _cache_put(self._rerank_cache, cache_key, ordered)
+        return ordered
+
 
     def check_location_in_query(self, query):
         """
-        LLM을 사용하여 쿼리에 지역명이 있는지 판단합니다.
+        LLM을 사용하여 쿼리에 지역명이 있는지 판단합니다. 결과는 쿼리 기준으로 캐시됩니다.
         """
+        if self._location_check_cache is None:
+            return self._check_location_in_query_impl(query)
+
+        cache_key = query.strip()
+        cached = _cache_get(self._location_check_cache, cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._check_location_in_query_impl(query)
+        _cache_put(self._location_check_cache, cache_key, result)
+        return result
+
+    def _check_location_in_query_impl(self, query):
         if self.gemini_client is None:
             return False
         
         try:
-            prompt = f"""
-    다음 질문에 한국의 지역명(시/도, 구/군, 동/읍/면 등)이 포함되어 있는지 판단해주세요.
-
-    질문: {query}
+            prompt = _CHECK_LOCATION_PROMPT.format(query=query)
 
-    주의사항:
-    - "운동", "문화", "프로그램" 등은 일반 명사이므로 지역명이 아닙니다
-    - "운동동"처럼 실제 지역명인 경우만 지역명으로 인정합니다
-    - 명확한 지역명이 있을 때만 True로 판단하세요
+            response_text = self._cached_generate_content(prompt, config=_CHECK_LOCATION_CONFIG)
 
-    ### 응답 형식:
-    JSON 형식으로 응답해주세요.
-    예시: {{"has_location": true, "location": "강북구", "reasoning": "강북구라는 명확한 지역명이 있음"}}
-    예시: {{"has_location": false, "location": null, "reasoning": "지역명이 없고 운동 관련 질문만 있음"}}
-    """
-            
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
-            
             try:
-                result = json.loads(response.text)
+                result = _loads_json(response_text)
                 return result.get('has_location', False), result.get('location')
             except json.JSONDecodeError:
-                # JSON 파싱 실패시 텍스트에서 판단
-                if "true" in response.text.lower() and "has_location" in response.text:
-                    return True, None
+                # response_mime_type으로 JSON을 강제하므로 파싱 실패는 사실상 없음
                 return False, None
                 
         except Exception as e:
@@ -299,64 +1177,24 @@ class QueryProcessor:
         """
         운동 관련 질문에서 카테고리(운동 부위나 목적)를 추출합니다.
         """
-        # 운동 부위 및 목적 키워드 매핑
-        category_mappings = {
-            # 신체 부위
-            '허리': ['허리', '요추', '척추', '등허리', '허리통증'],
-            '어깨': ['어깨', '견갑골', '승모근', '어깨통증'],
-            '목': ['목', '경추', '목통증', '거북목'],
-            '무릎': ['무릎', '슬개골', '무릎통증', '관절'],
-            '발목': ['발목', '발목통증', '족관절'],
-            '손목': ['손목', '손목통증', '수근관'],
-            '엉덩이': ['엉덩이', '둔부', '고관절', '힙'],
-            '복부': ['복부', '뱃살', '복근', '코어'],
-            '팔': ['팔', '이두근', '삼두근', '상완'],
-            '다리': ['다리', '하체', '종아리', '허벅지'],
-            '가슴': ['가슴', '흉근', '대흉근'],
-            '등': ['등', '광배근', '등근육'],
-            
-            # 운동 목적
-            '다이어트': ['다이어트', '체중감량', '살빼기', '체지방', '감량'],
-            '근력강화': ['근력', '근육', '강화', '벌크업'],
-            '유연성': ['유연성', '스트레칭', '유연', '스트레치'],
-            '균형': ['균형', '밸런스', '평형'],
-            '재활': ['재활', '회복', '치료', '물리치료'],
-            '자세교정': ['자세', '교정', '체형', '정렬'],
-            '체력': ['체력', '지구력', '스태미나', '심폐'],
-            '통증완화': ['통증', '완화', '진통', '아픔']
-        }
-        
         query_lower = query.lower()
-        
-        # 각 카테고리에 대해 키워드 매칭
-        for category, keywords in category_mappings.items():
-            for keyword in keywords:
-                if keyword in query_lower:
-                    print(f"운동 카테고리 추출: {category} (키워드: {keyword})")
-                    return category
+
+        # 컴파일된 교대 패턴으로 한 번에 키워드 매칭
+        match = _WORKOUT_KW_RE.search(query_lower)
+        if match:
+            keyword = match.group(0)
+            category = KEYWORD_TO_CATEGORY[keyword]
+            print(f"운동 카테고리 추출: {category} (키워드: {keyword})")
+            return category
         
         # 카테고리를 찾지 못한 경우 Gemini를 사용하여 추출
         if self.gemini_client:
             try:
-                prompt = f"""
-    다음 운동 관련 질문에서 주요 운동 부위나 목적을 추출해주세요.
-    질문: {query}
+                prompt = _WORKOUT_CATEGORY_PROMPT.format(query=query)
+                response_text = self._cached_generate_content(prompt)
 
-    가능한 카테고리:
-    신체 부위: 허리, 어깨, 목, 무릎, 발목, 손목, 엉덩이, 복부, 팔, 다리, 가슴, 등
-    운동 목적: 다이어트, 근력강화, 유연성, 균형, 재활, 자세교정, 체력, 통증완화
-
-    위 카테고리 중 하나만 선택해서 답변해주세요. 
-    만약 정확히 일치하는 카테고리가 없다면 가장 관련있는 것을 선택하세요.
-    카테고리 이름만 답변해주세요.
-    """
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.0-flash-lite",
-                    contents=prompt
-                )
-                
-                extracted_category = response.text.strip()
-                if extracted_category in category_mappings.keys():
+                extracted_category = response_text.strip()
+                if extracted_category in WORKOUT_CATEGORY_MAPPINGS:
                     print(f"Gemini로 추출한 운동 카테고리: {extracted_category}")
                     return extracted_category
                     
@@ -382,11 +1220,14 @@ class QueryProcessor:
         try:
             # 1. 카테고리 추출
             category = self.extract_workout_category(query)
-            
+
             # 2. 카테고리가 있으면 필터로 검색
+            # 카테고리 검색이 비는 경우를 대비해 Title 검색도 동시에 시작해 두고,
+            # 카테고리 결과가 없을 때 추가 왕복 없이 Title 결과를 사용한다
             if category:
                 print(f"카테고리 '{category}'로 운동 영상 검색...")
-                
+                title_future = _LLM_EXECUTOR.submit(self._search_workout_by_title, query, top_k)
+
                 search_params = {
                     "inputs": {"text": query},
                     "top_k": top_k,
@@ -394,36 +1235,25 @@ class QueryProcessor:
                 }
                 
                 # 검색 실행
-                try:
-                    search_result = self.dense_index.search(
-                        namespace="workout",
-                        query=search_params,
-                        fields=["Title", "Category", "Url"],
-                        rerank={
-                            "model": "bge-reranker-v2-m3",
-                            "top_n": 8,
-                            "rank_fields": ["Title"]
-                        },
-                    )
-                except Exception as rerank_error:
-                    if "maximum token limit" in str(rerank_error):
-                        print("토큰 제한 초과. rerank 없이 재시도...")
-                        search_result = self.dense_index.search(
-                            namespace="workout",
-                            query=search_params,
-                            fields=["Title", "Category", "Url"]
-                        )
-                    else:
-                        raise rerank_error
+                search_result = self._search_with_rerank(
+                    namespace="workout",
+                    search_params=search_params,
+                    fields=["Title", "Category", "Url"],
+                    rerank={
+                        "model": "bge-reranker-v2-m3",
+                        "top_n": 8,
+                        "rank_fields": ["Title"]
+                    },
+                )
                 
                 # 결과 확인
                 if search_result and 'result' in search_result and 'hits' in search_result['result']:
                     hits = search_result['result']['hits']
                     
-                    # 결과가 없으면 Title 검색으로 전환
+                    # 결과가 없으면 병렬로 수행해 둔 Title 검색 결과 사용
                     if len(hits) == 0:
-                        print(f"카테고리 '{category}'에 해당하는 결과가 없습니다. Title 검색으로 전환...")
-                        return self._search_workout_by_title(query, top_k)
+                        print(f"카테고리 '{category}'에 해당하는 결과가 없습니다. Title 검색 결과로 전환...")
+                        return title_future.result()
                     
                     print(f"카테고리 검색 결과: {len(hits)}개 운동 영상 발견")
                     return {
@@ -487,27 +1317,16 @@ class QueryProcessor:
             }
             
             # 검색 실행
-            try:
-                search_result = self.dense_index.search(
-                    namespace="workout",
-                    query=search_params,
-                    fields=["Title", "Category", "Url"],
-                    rerank={
-                        "model": "bge-reranker-v2-m3",
-                        "top_n": 8,
-                        "rank_fields": ["Title"]
-                    },
-                )
-            except Exception as rerank_error:
-                if "maximum token limit" in str(rerank_error):
-                    print("토큰 제한 초과. rerank 없이 재시도...")
-                    search_result = self.dense_index.search(
-                        namespace="workout",
-                        query=search_params,
-                        fields=["Title", "Category", "Url"]
-                    )
-                else:
-                    raise rerank_error
+            search_result = self._search_with_rerank(
+                namespace="workout",
+                search_params=search_params,
+                fields=["Title", "Category", "Url"],
+                rerank={
+                    "model": "bge-reranker-v2-m3",
+                    "top_n": 8,
+                    "rank_fields": ["Title"]
+                },
+            )
             
             if search_result and 'result' in search_result and 'hits' in search_result['result']:
                 hits = search_result['result']['hits']
@@ -555,53 +1374,54 @@ class QueryProcessor:
                 "confidence": 0,
                 "reasoning": "Gemini client is not initialized"
             }
-            
-        # Construct the prompt for the model
-        prompt = f"""
-    당신은 사용자 질문에 가장 적합한 namespace를 선택하는 시스템입니다. 
-    다음 정보를 참고하여 주어진 질문이 어떤 namespace에 가장 적합한지 판단하세요.
-
-    ### Namespace 정보:
-    {json.dumps(namespace_info, indent=2, ensure_ascii=False)}
 
-    ### 사용자 질문:
-    {query}
-
-    ### 응답 형식:
-    JSON 형식으로 응답해 주세요. 가장 적합한 namespace 하나와 그 선택에 대한 confidence score(0.0~1.0)를 제공하세요.
-    예시: {{"namespace": "namespace_key", "confidence": 0.95, "reasoning": "이 namespace를 선택한 이유"}}
+        # 동일(정규화 기준) 쿼리는 Gemini 호출 없이 저장된 선택 결과 반환
+        cache_key = None
+        if _NS_CACHE is not None and namespace_info is NAMESPACE_INFO:
+            cache_key = hashlib.blake2b(
+                query.strip().lower().encode('utf-8'), digest_size=16
+            ).digest()
+            cached = _cache_get(_NS_CACHE, cache_key)
+            if cached is not None:
+                return cached
 
-    항상 정확히 하나의 namespace만 선택하세요. 어떤 namespace에도 맞지 않는다면 confidence를 0.3 미만으로 설정하고 namespace를 null로 지정하세요.
-    """
+        # Construct the prompt for the model
+        # namespace_info가 기본값이면 미리 직렬화해 둔 JSON을 재사용
+        if namespace_info is NAMESPACE_INFO:
+            namespace_json = _NAMESPACE_JSON
+        else:
+            namespace_json = json.dumps(namespace_info, indent=2, ensure_ascii=False)
+        prompt = _NAMESPACE_PROMPT.format(namespace_json=namespace_json, query=query)
 
         # Generate response using Gemini
         try:
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
-            
+            response_text = self._cached_generate_content(prompt)
+
             # Parse the JSON response
             try:
                 # First, attempt to parse the response text directly
-                result = json.loads(response.text)
+                result = _loads_json(response_text)
                 
                 # Set namespace to None if confidence is very low (below 0.3)
                 if result.get('confidence', 0) < 0.3:
                     result['namespace'] = None
-                    
+
+                if cache_key is not None:
+                    _cache_put(_NS_CACHE, cache_key, result)
                 return result
             except (json.JSONDecodeError, AttributeError):
                 # If that fails, try to extract JSON from the text
-                json_match = re.search(r'\{[^}]+\}', response.text, re.DOTALL)
-                if json_match:
+                json_text = _first_json(response_text)
+                if json_text:
                     try:
-                        result = json.loads(json_match.group(0))
+                        result = _loads_json(json_text)
                         
                         # Set namespace to None if confidence is very low
                         if result.get('confidence', 0) < 0.3:
                             result['namespace'] = None
-                            
+
+                        if cache_key is not None:
+                            _cache_put(_NS_CACHE, cache_key, result)
                         return result
                     except json.JSONDecodeError:
                         pass
@@ -611,7 +1431,7 @@ class QueryProcessor:
                     "namespace": None,
                     "confidence": 0,
                     "reasoning": "Failed to parse model response",
-                    "raw_response": response.text
+                    "raw_response": response_text
                 }
         except Exception as e:
             return {
@@ -634,9 +1454,8 @@ class QueryProcessor:
             }
             
         try:
-            # 날씨 관련 질문인지 확인
-            weather_keywords = ["날씨", "기온", "강수", "비", "눈", "미세먼지", "황사", "자외선", "바람", "기상"]
-            is_weather_query = any(keyword in query for keyword in weather_keywords)
+            # 날씨 관련 질문인지 확인 (모듈 상수 교대 패턴으로 한 번만 스캔)
+            is_weather_query = _WEATHER_KW_RE.search(query) is not None
             
             # 날씨 관련 질문이면 구체적인 답변 유도
             if is_weather_query:
@@ -658,13 +1477,11 @@ class QueryProcessor:
 {query}
 """
             
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
+            # 같은 질문의 반복/동시 호출은 프롬프트 캐시와 단일 비행 병합을 공유
+            response_text = self._cached_generate_content(prompt)
             return {
                 "source": "llm",
-                "response": response.text,
+                "response": response_text,
                 "status": "success"
             }
         except Exception as e:
@@ -706,6 +1523,23 @@ class QueryProcessor:
         return namespace and namespace.startswith('kb')
     
     def extract_district_from_query(self, query, namespace):
+        """
+        사용자 쿼리에서 지역명을 추출합니다. 결과는 (쿼리, 네임스페이스) 기준으로
+        캐시되어 반복 쿼리는 추출 단계(LLM 호출 포함) 전체를 건너뜁니다.
+        """
+        if self._district_cache is None:
+            return self._extract_district_from_query_impl(query, namespace)
+
+        cache_key = (query, namespace)
+        cached = _cache_get(self._district_cache, cache_key)
+        if cached is not None:
+            return None if cached is _DISTRICT_NOT_FOUND else cached
+
+        result = self._extract_district_from_query_impl(query, namespace)
+        _cache_put(self._district_cache, cache_key, _DISTRICT_NOT_FOUND if result is None else result)
+        return result
+
+    def _extract_district_from_query_impl(self, query, namespace):
         """
         사용자 쿼리에서 지역명을 추출합니다.
         모든 네임스페이스에 대해 통합된 방식으로 지역을 추출합니다.
@@ -731,88 +1565,84 @@ class QueryProcessor:
         if namespace == "public_health_center":
             # 보건소는 전체 주소 형식 필요
             return extracted_info
-        elif self.is_seoul_namespace(namespace):
-            # 서울 네임스페이스는 구명만 필요
-            if "서울특별시" in extracted_info:
-                return extracted_info.replace("서울특별시 ", "")
-            return None
-        elif self.is_gyeonggi_namespace(namespace):
-            # 경기도 네임스페이스는 시/군명만 필요
-            if "경기도" in extracted_info:
-                return extracted_info.replace("경기도 ", "")
-            return None
-        elif self.is_incheon_namespace(namespace):
-            # 인천 네임스페이스는 구/군명만 필요
-            if "인천광역시" in extracted_info:
-                return extracted_info.replace("인천광역시 ", "")
+
+        # 서울/경기/인천 네임스페이스는 구/시/군명만 필요
+        city = city_for_namespace(namespace)
+        if city in ("서울특별시", "경기도", "인천광역시"):
+            if city in extracted_info:
+                return extracted_info.replace(f"{city} ", "")
             return None
-        else:
-            # 기타 네임스페이스는 전체 형식 반환
-            return extracted_info
+
+        # 기타 네임스페이스는 전체 형식 반환
+        return extracted_info
         
     def _extract_unified_district(self, query):
+        """
+        통합 지역 추출 결과를 쿼리 기준으로 캐시합니다.
+        process_query와 /query 비상 경로가 같은 쿼리로 중복 호출하는 것을 흡수합니다.
+        """
+        if self._unified_district_cache is None:
+            return self._extract_unified_district_impl(query)
+
+        cache_key = query.strip()
+        cached = _cache_get(self._unified_district_cache, cache_key)
+        if cached is not None:
+            return None if cached is _DISTRICT_NOT_FOUND else cached
+
+        result = self._extract_unified_district_impl(query)
+        _cache_put(self._unified_district_cache, cache_key, _DISTRICT_NOT_FOUND if result is None else result)
+        return result
+
+    def _extract_unified_district_impl(self, query):
         """
         모든 지역(서울, 경기, 인천, 부산, 경북)에서 통합적으로 지역명을 추출합니다.
         
         Returns:
             str: "도시명 구/시/군명" 형식 (예: "부산광역시 해운대구")
         """
-        # 1. 모든 지역 목록 생성
-        all_districts = []
-        district_to_city = {}
-        
-        # 서울시 구 추가
-        for district in SEOUL_DISTRICT_NEIGHBORS.keys():
-            all_districts.append(district)
-            district_to_city[district] = "서울특별시"
-        
-        # 경기도 시·군 추가
-        for district in GYEONGGI_DISTRICT_NEIGHBORS.keys():
-            all_districts.append(district)
-            district_to_city[district] = "경기도"
-        
-        # 인천시 구·군 추가
-        for district in ICH_DISTRICT_NEIGHBORS.keys():
-            all_districts.append(district)
-            district_to_city[district] = "인천광역시"
-        
-        # 부산시 구·군 추가
-        for district in BUSAN_DISTRICT_NEIGHBORS.keys():
-            all_districts.append(district)
-            district_to_city[district] = "부산광역시"
-        
-        # 경상북도 시·군 추가
-        for district in GYEONGBUK_DISTRICT_NEIGHBORS.keys():
-            all_districts.append(district)
-            district_to_city[district] = "경상북도"
-        
-        # 특별 처리: 쿼리에 특정 도시명이 포함되어 있고 동 이름이 있는 경우
-        city_keywords = {
-            "부산": "부산광역시",
-            "서울": "서울특별시",
-            "인천": "인천광역시",
-            "대구": "대구광역시",
-            "광주": "광주광역시",
-            "대전": "대전광역시",
-            "울산": "울산광역시"
-        }
-        
+        # 1. 미리 구성된 통합 지역 색인 사용
+        all_districts = ALL_DISTRICTS
+        district_to_city = ALL_DISTRICT_TO_CITY
+
+        # 0. Aho-Corasick 단일 패스: 구/시/군, 등록된 동, 도시명을 한 번의 스캔으로 탐지
         detected_city = None
-        for keyword, city_name in city_keywords.items():
-            if keyword in query:
-                detected_city = city_name
-                break
-        
+        if _DISTRICT_AUTOMATON is not None:
+            dong_hit = None
+            for _, (kind, value) in _DISTRICT_AUTOMATON.iter(query):
+                if kind == 'district':
+                    # 구/시/군 직접 매칭이 최우선
+                    logger.debug("쿼리에서 지역 직접 발견: %s", value)
+                    return value
+                elif kind == 'dong' and dong_hit is None:
+                    dong_hit = value
+                elif kind == 'city' and detected_city is None:
+                    detected_city = value
+
+            if dong_hit:
+                logger.debug("등록된 동 이름으로 지역 결정: %s", dong_hit)
+                return dong_hit
+        else:
+            # 특별 처리: 쿼리에 특정 도시명이 포함되어 있고 동 이름이 있는 경우
+            for keyword, city_name in CITY_KEYWORDS.items():
+                if keyword in query:
+                    detected_city = city_name
+                    break
+
         if detected_city:
-            dong_pattern = r'(\w+동)'
-            dong_matches = re.findall(dong_pattern, query)
+            dong_matches = _RE_DONG.findall(query)
             
             if dong_matches and self.gemini_client:
                 dong_name = dong_matches[0]
-                print(f"{detected_city}에서 동 이름 발견: {dong_name}")
+                logger.debug("%s에서 동 이름 발견: %s", detected_city, dong_name)
+
+                # 정적 동 색인에 등록된 동이면 LLM 호출 없이 바로 결정
+                hit = DONG_TO_DISTRICT.get(dong_name)
+                if hit:
+                    logger.debug("정적 동 색인으로 지역 결정: %s %s", hit[0], hit[1])
+                    return f"{hit[0]} {hit[1]}"
                 
-                # 해당 도시의 구 목록 가져오기
-                city_districts = [d for d, city in district_to_city.items() if city == detected_city]
+                # 해당 도시의 구 목록 가져오기 (미리 구성한 역색인 사용)
+                city_districts = CITY_TO_DISTRICTS.get(detected_city, ())
                 
                 if city_districts:
                     try:
@@ -821,7 +1651,7 @@ class QueryProcessor:
     동 이름: {dong_name}
 
     ### {detected_city}의 행정구 목록:
-    {", ".join(city_districts)}
+    {CITY_DISTRICT_CSV.get(detected_city, "")}
 
     ### 응답 형식:
     JSON 형식으로 응답해주세요: {{"district": "구이름"}}
@@ -832,59 +1662,84 @@ class QueryProcessor:
     - 중앙동 → {{"district": "중구"}}
     - 광안동 → {{"district": "수영구"}}
     """
-                        response = self.gemini_client.models.generate_content(
-                            model="gemini-2.0-flash-lite",
-                            contents=prompt
-                        )
-                        
+                        response_text = self._cached_generate_content(prompt, config=_DISTRICT_ONLY_CONFIG)
+
                         try:
-                            json_match = re.search(r'\{[^}]+\}', response.text, re.DOTALL)
-                            if json_match:
-                                result = json.loads(json_match.group(0))
+                            json_text = _first_json(response_text)
+                            if json_text:
+                                result = _loads_json(json_text)
                                 district = result.get('district')
                                 if district and district in city_districts:
-                                    print(f"LLM이 '{dong_name}'이(가) {detected_city} {district}에 속한다고 판단")
+                                    logger.debug("LLM이 '%s'이(가) %s %s에 속한다고 판단", dong_name, detected_city, district)
                                     return f"{detected_city} {district}"
-                        except Exception as e:
-                            print(f"LLM 응답 파싱 오류: {str(e)}")
+                        except (ValueError, TypeError, KeyError) as e:
+                            logger.warning("LLM 응답 파싱 오류: %s", e)
                     
                     except Exception as e:
-                        print(f"동 이름으로 구 찾기 중 오류: {str(e)}")
+                        logger.warning("동 이름으로 구 찾기 중 오류: %s", e)
         
-        # 2. 쿼리에서 직접 매칭되는 지역명 찾기
-        for district in all_districts:
-            if district in query:
+        # 2~3. 교대 패턴 폴백 (오토마톤이 있으면 0단계 스캔이 모든 지역명을 이미 확인했으므로 생략)
+        # 지역명이 모두 구/시/군으로 끝나므로 기존의 지역별 in 검사와 토큰 정규식을 모두 대체한다
+        if _DISTRICT_MEGA_RE is not None:
+            match = _DISTRICT_MEGA_RE.search(query)
+            if match:
+                district = match.group(0)
                 city = district_to_city[district]
-                print(f"쿼리에서 지역 직접 발견: {city} {district}")
+                logger.debug("쿼리에서 지역 직접 발견: %s %s", city, district)
                 return f"{city} {district}"
         
-        # 3. 정규식으로 구/시/군 패턴 찾기
-        patterns = [
-            r'(\w+구)',  # XX구
-            r'(\w+시)',  # XX시
-            r'(\w+군)'   # XX군
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, query)
-            for match in matches:
-                if match in all_districts:
-                    city = district_to_city[match]
-                    print(f"정규식으로 지역 발견: {city} {match}")
-                    return f"{city} {match}"
-        
-        # 4. '동' 이름으로 구/시/군 찾기 (도시가 특정되지 않은 경우)
-        dong_pattern = r'(\w+동)'
-        dong_matches = re.findall(dong_pattern, query)
-        
-        if dong_matches and self.gemini_client:
-            dong_name = dong_matches[0]
-            print(f"동 이름 발견: {dong_name}")
-            
+        # 4~6. LLM 폴백 - 동/후보 단어/전체 쿼리 세 질문을 하나의 프롬프트로 묶어 한 번만 호출
+        if self.gemini_client:
+            dong_matches = _RE_DONG.findall(query)
+            dong_name = dong_matches[0] if dong_matches else None
+            if dong_name:
+                logger.debug("동 이름 발견: %s", dong_name)
+                # 정적 동 색인에 등록된 동이면 LLM 호출 없이 바로 결정
+                hit = DONG_TO_DISTRICT.get(dong_name)
+                if hit:
+                    logger.debug("정적 동 색인으로 지역 결정: %s %s", hit[0], hit[1])
+                    return f"{hit[0]} {hit[1]}"
+
+            # 너무 짧은 단어(2글자 미만)와 일반 검색어는 후보에서 제외
+            location_words = [
+                word for word in query.split()
+                if len(word) >= 2 and not _RE_EXCLUDE.search(word)
+            ]
+            if location_words:
+                logger.debug("가능한 지역명 후보: %s", location_words)
+
+            # 동도 후보 단어도 없는 짧은 쿼리는 지역이 없는 것으로 보고 LLM 왕복을 생략
+            if dong_name is None and not location_words and _approx_tokens(query) <= 20:
+                logger.debug("지역 후보 없음 - LLM 폴백 생략")
+                return None
+
             try:
-                prompt = f"""
-    다음 동(洞) 이름이 한국의 어느 지역에 속하는지 정확히 알려주세요.
-    동 이름: {dong_name}
+                result = self._ask_gemini_combined(query, dong_name, location_words)
+                if result:
+                    return result
+            except Exception as e:
+                logger.warning("LLM 지역 추출 중 오류 발생: %s", e)
+
+        # 지역을 찾지 못한 경우
+        logger.debug("쿼리에서 지역을 찾을 수 없음")
+        return None
+
+    def _ask_gemini_combined(self, query, dong_name, location_words):
+        """동 이름/후보 단어/전체 쿼리 세 가지 관점을 한 번의 LLM 호출로 판단합니다.
+
+        지역 목록 열거가 프롬프트 크기를 지배하므로, 질문을 하나로 묶으면
+        왕복 횟수와 입력 토큰이 모두 1/3로 줄어듭니다. 실패 시 None.
+        """
+        prompt = f"""
+    다음 사용자 질문에서 한국의 행정구역(시/도 + 구/시/군)을 추출해주세요.
+    질문: {query}
+    추출된 동 이름: {dong_name or "없음"}
+    지역명 후보 단어: {", ".join(location_words) if location_words else "없음"}
+
+    세 가지 관점에서 각각 판단해주세요:
+    1. from_dong: 동 이름이 속한 지역 (동 이름이 없으면 null)
+    2. from_candidates: 후보 단어들 중 지역명으로 판단되는 단어가 속한 지역 (없으면 null)
+    3. from_full_query: 질문 전체에서 추출한 지역 (역 이름, 동네 이름 등 포함)
 
     주요 동 이름과 소속 지역 예시:
     - 지제동: 경기도 평택시
@@ -898,187 +1753,76 @@ class QueryProcessor:
     - 서면동: 부산광역시 부산진구
     - 광안동: 부산광역시 수영구
 
-    ### 가능한 행정구역:
-    서울특별시: {", ".join([d for d in all_districts if district_to_city[d] == "서울특별시"])}
-    경기도: {", ".join([d for d in all_districts if district_to_city[d] == "경기도"])}
-    인천광역시: {", ".join([d for d in all_districts if district_to_city[d] == "인천광역시"])}
-    부산광역시: {", ".join([d for d in all_districts if district_to_city[d] == "부산광역시"])}
-    경상북도: {", ".join([d for d in all_districts if district_to_city[d] == "경상북도"])}
-
-    ### 응답 형식:
-    JSON 형식으로 응답해주세요: {{"city": "도시명", "district": "구/시/군명"}}
-    찾을 수 없으면: {{"city": null, "district": null}}
-    """
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.0-flash-lite",
-                    contents=prompt
-                )
-                
-                try:
-                    json_match = re.search(r'\{[^}]+\}', response.text, re.DOTALL)
-                    if json_match:
-                        result = json.loads(json_match.group(0))
-                        if result.get('city') and result.get('district'):
-                            city = result['city']
-                            district = result['district']
-                            if district in all_districts:
-                                print(f"LLM이 '{dong_name}'이(가) 속한 지역을 찾음: {city} {district}")
-                                return f"{city} {district}"
-                            else:
-                                print(f"LLM이 찾은 '{district}'는 등록된 지역이 아닙니다.")
-                except Exception as e:
-                    print(f"LLM 응답 파싱 오류: {str(e)}")
-                        
-            except Exception as e:
-                print(f"동 이름으로 지역 추출 중 오류 발생: {str(e)}")
-        
-        # 5. 지역명 패턴이 없는 경우 LLM으로 분석
-        if self.gemini_client:
-            try:
-                # 쿼리에서 가능한 지역명 추출
-                location_words = []
-                words = query.split()
-                
-                for word in words:
-                    # 너무 짧은 단어는 제외 (2글자 이상)
-                    if len(word) >= 2:
-                        # 일반적인 검색어는 제외
-                        exclude_words = ['일자리', '복지', '프로그램', '문화', '센터', '시설', '병원', '학교', '마트']
-                        if not any(exclude in word for exclude in exclude_words):
-                            location_words.append(word)
-                
-                if location_words:
-                    print(f"가능한 지역명 후보: {location_words}")
-                    
-                    prompt = f"""
-    다음 단어들 중에서 한국의 지역명을 찾아주세요.
-    단어들: {', '.join(location_words)}
-
     주요 지역명 예시:
-    - 호매실: 경기도 수원시 권선구의 지역명
-    - 정자: 경기도 성남시 분당구의 지역명  
-    - 판교: 경기도 성남시 분당구의 지역명
-    - 송도: 인천광역시 연수구의 지역명
-    - 해운대: 부산광역시 해운대구의 지역명
-    - 서면: 부산광역시 부산진구의 지역명
-    - 광안리: 부산광역시 수영구의 지역명
+    - 호매실: 경기도 수원시
+    - 정자: 경기도 성남시
+    - 판교: 경기도 성남시
+    - 송도: 인천광역시 연수구
+    - 해운대: 부산광역시 해운대구
+    - 서면: 부산광역시 부산진구
+    - 광안리: 부산광역시 수영구
 
     ### 가능한 행정구역:
-    서울특별시: {", ".join([d for d in all_districts if district_to_city[d] == "서울특별시"])}
-    경기도: {", ".join([d for d in all_districts if district_to_city[d] == "경기도"])}
-    인천광역시: {", ".join([d for d in all_districts if district_to_city[d] == "인천광역시"])}
-    부산광역시: {", ".join([d for d in all_districts if district_to_city[d] == "부산광역시"])}
-    경상북도: {", ".join([d for d in all_districts if district_to_city[d] == "경상북도"])}
+    {ALL_DISTRICTS_PROMPT_BLOCK}
 
     ### 응답 형식:
-    JSON 형식으로 응답해주세요: {{"location": "지역명", "city": "도시명", "district": "구/시/군명"}}
-    지역을 찾을 수 없으면: {{"location": null, "city": null, "district": null}}
+    JSON 형식으로만 응답해주세요:
+    {{"from_dong": {{"city": "도시명", "district": "구/시/군명"}}, "from_candidates": {{"city": ..., "district": ...}}, "from_full_query": {{"city": ..., "district": ...}}}}
+    해당 관점에서 찾을 수 없으면 해당 슬롯에 {{"city": null, "district": null}}을 넣어주세요.
     """
-                    response = self.gemini_client.models.generate_content(
-                        model="gemini-2.0-flash-lite",
-                        contents=prompt
-                    )
-                    
-                    try:
-                        json_match = re.search(r'\{[^}]+\}', response.text, re.DOTALL)
-                        if json_match:
-                            result = json.loads(json_match.group(0))
-                            if result.get('city') and result.get('district'):
-                                city = result['city']
-                                district = result['district']
-                                location = result.get('location', '')
-                                
-                                if district in all_districts:
-                                    print(f"LLM이 '{location}' 지역을 찾음: {city} {district}")
-                                    return f"{city} {district}"
-                                else:
-                                    print(f"LLM이 찾은 '{district}'는 등록된 지역이 아닙니다.")
-                    except Exception as e:
-                        print(f"LLM 응답 파싱 오류: {str(e)}")
-                            
-            except Exception as e:
-                print(f"LLM 지역 추출 중 오류 발생: {str(e)}")
-        
-        # 6. 마지막으로 전체 쿼리를 LLM에 전달하여 지역 추출 시도
-        if self.gemini_client:
-            try:
-                prompt = f"""
-    다음 질문에서 한국의 지역명을 추출해주세요.
-    질문: {query}
-
-    일반적인 지역명 패턴:
-    1. XX시, XX구, XX군, XX동 형태
-    2. 지역 이름만 (예: 호매실, 정자, 판교, 일산, 평촌, 해운대, 서면)
-    3. 역 이름 (예: 강남역, 홍대입구역) - 역 이름에서 지역 추출
-
-    ### 가능한 행정구역:
-    서울특별시: {", ".join([d for d in all_districts if district_to_city[d] == "서울특별시"])}
-    경기도: {", ".join([d for d in all_districts if district_to_city[d] == "경기도"])}
-    인천광역시: {", ".join([d for d in all_districts if district_to_city[d] == "인천광역시"])}
-    부산광역시: {", ".join([d for d in all_districts if district_to_city[d] == "부산광역시"])}
-    경상북도: {", ".join([d for d in all_districts if district_to_city[d] == "경상북도"])}
+        response_text = self._cached_generate_content(prompt, config=_COMBINED_DISTRICT_CONFIG)
 
-    ### 응답 형식:
-    JSON 형식으로 응답해주세요: {{"city": "도시명", "district": "구/시/군명"}}
-    지역을 찾을 수 없으면: {{"city": null, "district": null}}
-    """
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.0-flash-lite",
-                    contents=prompt
-                )
-                
-                try:
-                    json_match = re.search(r'\{[^}]+\}', response.text, re.DOTALL)
-                    if json_match:
-                        result = json.loads(json_match.group(0))
-                        if result.get('city') and result.get('district'):
-                            city = result['city']
-                            district = result['district']
-                            if district in all_districts:
-                                print(f"LLM으로 지역 추출: {city} {district}")
-                                return f"{city} {district}"
-                except:
-                    pass
-                    
-            except Exception as e:
-                print(f"LLM 지역 추출 중 오류 발생: {str(e)}")
-        
-        # 지역을 찾지 못한 경우
-        print("쿼리에서 지역을 찾을 수 없음")
+        try:
+            json_text = _first_json(response_text)
+            if json_text:
+                result = _loads_json(json_text)
+                # 원래의 단계 우선순위(동 → 후보 단어 → 전체 쿼리) 유지
+                for slot in ('from_dong', 'from_candidates', 'from_full_query'):
+                    info = result.get(slot)
+                    if isinstance(info, dict) and info.get('city') and info.get('district'):
+                        city = info['city']
+                        district = info['district']
+                        if district in ALL_DISTRICTS_SET:
+                            logger.debug("LLM 통합 추출(%s): %s %s", slot, city, district)
+                            return f"{city} {district}"
+                        else:
+                            logger.debug("LLM이 찾은 '%s'는 등록된 지역이 아닙니다.", district)
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning("LLM 응답 파싱 오류: %s", e)
         return None
 
-
-
     def _extract_seoul_district(self, query):
         """
         서울시 구 이름을 추출합니다.
         동 이름이 포함된 경우, 해당 동이 속한 구를 찾습니다.
         """
-        all_districts = list(SEOUL_DISTRICT_NEIGHBORS.keys())
-        
         # 정규식 패턴: '구' 글자가 포함된 단어
-        pattern = r'(\w+구)'
-        matches = re.findall(pattern, query)
+        matches = _RE_GU.findall(query)
         
         # 추출된 '구' 중에서 실제 서울시 구인지 확인
         for match in matches:
-            if match in all_districts:
+            if match in SEOUL_DISTRICTS:
                 return match
         
         # '동' 이름이 포함된 경우 확인
-        dong_pattern = r'(\w+동)'
-        dong_matches = re.findall(dong_pattern, query)
+        dong_matches = _RE_DONG.findall(query)
         
         if dong_matches and self.gemini_client:
             # 동 이름이 있는 경우, 해당 동이 속한 구를 찾기
             dong_name = dong_matches[0]
+
+            # 정적 동 색인에 등록된 동이면 LLM 호출 없이 결정
+            hit = DONG_TO_DISTRICT.get(dong_name)
+            if hit and hit[0] == "서울특별시" and hit[1] in SEOUL_DISTRICTS:
+                return hit[1]
+
             try:
                 prompt = f"""
 다음 동(洞) 이름이 서울시의 어느 구에 속하는지 알려주세요.
 동 이름: {dong_name}
 
 ### 가능한 서울시 구 목록:
-{", ".join(all_districts)}
+{_SEOUL_DISTRICT_CSV}
 
 ### 응답 형식:
 해당 동이 속한 구 이름만 답변해 주세요 (예: "강남구", "종로구").
@@ -1089,17 +1833,14 @@ class QueryProcessor:
 - 명동은 중구에 속합니다
 - 신촌동은 서대문구에 속합니다
 """
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.0-flash-lite",
-                    contents=prompt
-                )
+                response_text = self._cached_generate_content(prompt)
                 
-                extracted_district = response.text.strip()
-                if extracted_district in all_districts:
-                    print(f"'{dong_name}'이(가) 속한 구: {extracted_district}")
+                extracted_district = response_text.strip()
+                if extracted_district in SEOUL_DISTRICTS:
+                    logger.debug("'%s'이(가) 속한 구: %s", dong_name, extracted_district)
                     return extracted_district
             except Exception as e:
-                print(f"동 이름으로 구 추출 중 오류 발생: {str(e)}")
+                logger.warning("동 이름으로 구 추출 중 오류 발생: %s", e)
         
         # Gemini를 통한 일반적인 구 추출 시도
         try:
@@ -1112,22 +1853,19 @@ class QueryProcessor:
 {query}
 
 ### 가능한 서울시 구 목록:
-{", ".join(all_districts)}
+{_SEOUL_DISTRICT_CSV}
 
 ### 응답 형식:
 구 이름만 답변해 주세요 (예: "강남구"). 없으면 "없음"이라고만 답변하세요.
 """
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
+            response_text = self._cached_generate_content(prompt)
             
-            extracted_district = response.text.strip()
-            if extracted_district in all_districts:
+            extracted_district = response_text.strip()
+            if extracted_district in SEOUL_DISTRICTS:
                 return extracted_district
                 
         except Exception as e:
-            print(f"서울 구 추출 중 오류 발생: {str(e)}")
+            logger.warning("서울 구 추출 중 오류 발생: %s", e)
         
         return None
     
@@ -1136,31 +1874,33 @@ class QueryProcessor:
         경기도 시·군 이름을 추출합니다.
         동 이름이 포함된 경우, 해당 동이 속한 시·군을 찾습니다.
         """
-        all_districts = list(GYEONGGI_DISTRICT_NEIGHBORS.keys())
-        
         # 정규식 패턴: '시' 또는 '군' 글자가 포함된 단어
-        pattern = r'(\w+[시군])'
-        matches = re.findall(pattern, query)
+        matches = _RE_SIGUN.findall(query)
         
         # 추출된 시·군 중에서 실제 경기도 시·군인지 확인
         for match in matches:
-            if match in all_districts:
+            if match in GYEONGGI_DISTRICTS:
                 return match
         
         # '동' 이름이 포함된 경우 확인
-        dong_pattern = r'(\w+동)'
-        dong_matches = re.findall(dong_pattern, query)
+        dong_matches = _RE_DONG.findall(query)
         
         if dong_matches and self.gemini_client:
             # 동 이름이 있는 경우, 해당 동이 속한 시·군을 찾기
             dong_name = dong_matches[0]
+
+            # 정적 동 색인에 등록된 동이면 LLM 호출 없이 결정
+            hit = DONG_TO_DISTRICT.get(dong_name)
+            if hit and hit[0] == "경기도" and hit[1] in GYEONGGI_DISTRICTS:
+                return hit[1]
+
             try:
                 prompt = f"""
 다음 동(洞) 이름이 경기도의 어느 시·군에 속하는지 알려주세요.
 동 이름: {dong_name}
 
 ### 가능한 경기도 시·군 목록:
-{", ".join(all_districts)}
+{_GYEONGGI_DISTRICT_CSV}
 
 ### 응답 형식:
 해당 동이 속한 시·군 이름만 답변해 주세요 (예: "수원시", "평택시").
@@ -1171,17 +1911,14 @@ class QueryProcessor:
 - 정자동은 성남시에 속합니다
 - 행신동은 고양시에 속합니다
 """
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.0-flash-lite",
-                    contents=prompt
-                )
+                response_text = self._cached_generate_content(prompt)
                 
-                extracted_district = response.text.strip()
-                if extracted_district in all_districts:
-                    print(f"'{dong_name}'이(가) 속한 시·군: {extracted_district}")
+                extracted_district = response_text.strip()
+                if extracted_district in GYEONGGI_DISTRICTS:
+                    logger.debug("'%s'이(가) 속한 시·군: %s", dong_name, extracted_district)
                     return extracted_district
             except Exception as e:
-                print(f"동 이름으로 시·군 추출 중 오류 발생: {str(e)}")
+                logger.warning("동 이름으로 시·군 추출 중 오류 발생: %s", e)
         
         # Gemini를 통한 일반적인 시·군 추출 시도
         try:
@@ -1194,22 +1931,19 @@ class QueryProcessor:
 {query}
 
 ### 가능한 경기도 시·군 목록:
-{", ".join(all_districts)}
+{_GYEONGGI_DISTRICT_CSV}
 
 ### 응답 형식:
 시·군 이름만 답변해 주세요 (예: "수원시", "연천군"). 없으면 "없음"이라고만 답변하세요.
 """
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
+            response_text = self._cached_generate_content(prompt)
             
-            extracted_district = response.text.strip()
-            if extracted_district in all_districts:
+            extracted_district = response_text.strip()
+            if extracted_district in GYEONGGI_DISTRICTS:
                 return extracted_district
                 
         except Exception as e:
-            print(f"경기도 시·군 추출 중 오류 발생: {str(e)}")
+            logger.warning("경기도 시·군 추출 중 오류 발생: %s", e)
         
         return None
     
@@ -1218,31 +1952,33 @@ class QueryProcessor:
         인천시 구·군 이름을 추출합니다.
         동 이름이 포함된 경우, 해당 동이 속한 구·군을 찾습니다.
         """
-        all_districts = list(ICH_DISTRICT_NEIGHBORS.keys())
-        
         # 정규식 패턴: '구' 또는 '군' 글자가 포함된 단어
-        pattern = r'(\w+[구군])'
-        matches = re.findall(pattern, query)
+        matches = _RE_GUGUN.findall(query)
         
         # 추출된 구·군 중에서 실제 인천시 구·군인지 확인
         for match in matches:
-            if match in all_districts:
+            if match in ICH_DISTRICTS:
                 return match
         
         # '동' 이름이 포함된 경우 확인
-        dong_pattern = r'(\w+동)'
-        dong_matches = re.findall(dong_pattern, query)
+        dong_matches = _RE_DONG.findall(query)
         
         if dong_matches and self.gemini_client:
             # 동 이름이 있는 경우, 해당 동이 속한 구·군을 찾기
             dong_name = dong_matches[0]
+
+            # 정적 동 색인에 등록된 동이면 LLM 호출 없이 결정
+            hit = DONG_TO_DISTRICT.get(dong_name)
+            if hit and hit[0] == "인천광역시" and hit[1] in ICH_DISTRICTS:
+                return hit[1]
+
             try:
                 prompt = f"""
 다음 동(洞) 이름이 인천시의 어느 구·군에 속하는지 알려주세요.
 동 이름: {dong_name}
 
 ### 가능한 인천시 구·군 목록:
-{", ".join(all_districts)}
+{_ICH_DISTRICT_CSV}
 
 ### 응답 형식:
 해당 동이 속한 구·군 이름만 답변해 주세요 (예: "연수구", "부평구").
@@ -1253,17 +1989,14 @@ class QueryProcessor:
 - 구월동은 남동구에 속합니다
 - 부평동은 부평구에 속합니다
 """
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.0-flash-lite",
-                    contents=prompt
-                )
+                response_text = self._cached_generate_content(prompt)
                 
-                extracted_district = response.text.strip()
-                if extracted_district in all_districts:
-                    print(f"'{dong_name}'이(가) 속한 구·군: {extracted_district}")
+                extracted_district = response_text.strip()
+                if extracted_district in ICH_DISTRICTS:
+                    logger.debug("'%s'이(가) 속한 구·군: %s", dong_name, extracted_district)
                     return extracted_district
             except Exception as e:
-                print(f"동 이름으로 구·군 추출 중 오류 발생: {str(e)}")
+                logger.warning("동 이름으로 구·군 추출 중 오류 발생: %s", e)
         
         # Gemini를 통한 일반적인 구·군 추출 시도
         try:
@@ -1276,22 +2009,19 @@ class QueryProcessor:
 {query}
 
 ### 가능한 인천시 구·군 목록:
-{", ".join(all_districts)}
+{_ICH_DISTRICT_CSV}
 
 ### 응답 형식:
 구·군 이름만 답변해 주세요 (예: "남동구", "강화군"). 없으면 "없음"이라고만 답변하세요.
 """
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
+            response_text = self._cached_generate_content(prompt)
             
-            extracted_district = response.text.strip()
-            if extracted_district in all_districts:
+            extracted_district = response_text.strip()
+            if extracted_district in ICH_DISTRICTS:
                 return extracted_district
                 
         except Exception as e:
-            print(f"인천 구·군 추출 중 오류 발생: {str(e)}")
+            logger.warning("인천 구·군 추출 중 오류 발생: %s", e)
         
         return None
     
@@ -1300,284 +2030,83 @@ class QueryProcessor:
         지정된 지역과 인접한 지역 목록을 반환합니다.
         네임스페이스에 따라 서울, 경기도, 인천, 부산, 경북 인접 정보를 사용합니다.
         """
-        if self.is_seoul_namespace(namespace):
-            return self._get_seoul_nearby_districts(district, max_neighbors)
-        elif self.is_gyeonggi_namespace(namespace):
-            return self._get_gyeonggi_nearby_districts(district, max_neighbors)
-        elif self.is_incheon_namespace(namespace):
-            return self._get_incheon_nearby_districts(district, max_neighbors)
-        elif self.is_busan_namespace(namespace):
-            return self._get_busan_nearby_districts(district, max_neighbors)
-        elif self.is_gyeongbuk_namespace(namespace):
-            return self._get_gyeongbuk_nearby_districts(district, max_neighbors)
-        else:
+        region = _NS_PREFIX_TO_REGION.get(namespace.split('_', 1)[0]) if namespace else None
+        if region is None:
             return []
+        return self._get_region_nearby_districts(region, district, max_neighbors)
         
 
-    def _get_seoul_nearby_districts(self, district, max_neighbors=3):
+    def _get_region_nearby_districts(self, region, district, max_neighbors=3):
         """
-        서울시 구의 인접 구 목록을 반환합니다.
+        지역 공통: 대상 지역과 인접 지역 목록을 반환합니다.
         """
-        if not district or district not in SEOUL_DISTRICT_NEIGHBORS:
-            return ['강남구', '서초구', '종로구']  # 기본 인기 지역
-        
-        neighbors = SEOUL_DISTRICT_NEIGHBORS.get(district, [])[:max_neighbors]
-        return [district] + neighbors
-    
-    def _get_gyeonggi_nearby_districts(self, district, max_neighbors=3):
-        """
-        경기도 시·군의 인접 시·군 목록을 반환합니다.
-        """
-        if not district or district not in GYEONGGI_DISTRICT_NEIGHBORS:
-            return ['수원시', '성남시', '고양시']  # 기본 인기 지역
-        
-        neighbors = GYEONGGI_DISTRICT_NEIGHBORS.get(district, [])[:max_neighbors]
-        return [district] + neighbors
-    
-    def _get_incheon_nearby_districts(self, district, max_neighbors=3):
-        """
-        인천시 구·군의 인접 구·군 목록을 반환합니다.
-        """
-        if not district or district not in ICH_DISTRICT_NEIGHBORS:
-            return ['남동구', '부평구', '연수구']  # 기본 인기 지역
-        
-        neighbors = ICH_DISTRICT_NEIGHBORS.get(district, [])[:max_neighbors]
-        # 강화군이나 옹진군처럼 인접 지역이 없는 경우 처리
-        if not neighbors:
-            # 섬 지역인 경우 다른 주요 구들을 반환
-            return [district] + ['남동구', '부평구', '연수구'][:max_neighbors]
-        return [district] + neighbors
-    
-
-    def _get_busan_nearby_districts(self, district, max_neighbors=3):
-        """
-        부산시 구·군의 인접 구·군 목록을 반환합니다.
-        """
-        if not district or district not in BUSAN_DISTRICT_NEIGHBORS:
-            return ['해운대구', '부산진구', '남구']  # 기본 인기 지역
-        
-        neighbors = BUSAN_DISTRICT_NEIGHBORS.get(district, [])[:max_neighbors]
-        return [district] + neighbors
+        if max_neighbors == 3:
+            # 기본 경로: 임포트 시점에 계산해 둔 튜플 사용 (할당/슬라이싱 없음)
+            nearby = _PRECOMPUTED_NEARBY[region].get(district) if district else None
+            return list(nearby) if nearby else list(_REGION_DEFAULT_NEARBY[region])
 
+        neighbors_map = _REGION_NEIGHBORS[region]
+        if not district or district not in neighbors_map:
+            return list(_REGION_DEFAULT_NEARBY[region])  # 기본 인기 지역
 
-    def _get_gyeongbuk_nearby_districts(self, district, max_neighbors=3):
-        """
-        경상북도 시·군의 인접 시·군 목록을 반환합니다.
-        """
-        if not district or district not in GYEONGBUK_DISTRICT_NEIGHBORS:
-            return ['포항시', '경주시', '안동시']  # 기본 인기 지역
-        
-        neighbors = GYEONGBUK_DISTRICT_NEIGHBORS.get(district, [])[:max_neighbors]
-        # 울릉군처럼 인접 지역이 없는 경우 처리
+        neighbors = neighbors_map[district][:max_neighbors]
+        # 강화군/옹진군/울릉군처럼 인접 지역이 없는 섬 지역 처리
         if not neighbors:
-            return [district] + ['포항시', '경주시', '안동시'][:max_neighbors]
+            return [district] + list(_REGION_DEFAULT_NEARBY[region])[:max_neighbors]
         return [district] + neighbors
-    
+
     def select_relevant_nearby_districts(self, query, target_district, namespace, max_neighbors=3):
         """
         검색어와 관련성이 높은 인접 지역을 선택합니다.
         """
-        if self.is_seoul_namespace(namespace):
-            return self._select_seoul_relevant_districts(query, target_district, max_neighbors)
-        elif self.is_gyeonggi_namespace(namespace):
-            return self._select_gyeonggi_relevant_districts(query, target_district, max_neighbors)
-        elif self.is_incheon_namespace(namespace):
-            return self._select_incheon_relevant_districts(query, target_district, max_neighbors)
-        elif self.is_busan_namespace(namespace):
-            return self._select_busan_relevant_districts(query, target_district, max_neighbors)
-        elif self.is_gyeongbuk_namespace(namespace):
-            return self._select_gyeongbuk_relevant_districts(query, target_district, max_neighbors)
-        else:
+        region = _NS_PREFIX_TO_REGION.get(namespace.split('_', 1)[0]) if namespace else None
+        if region is None:
             return self.get_nearby_districts(target_district, namespace, max_neighbors)
+        return self._select_region_relevant_districts(region, query, target_district, max_neighbors)
         
-    def _select_seoul_relevant_districts(self, query, target_district, max_neighbors=3):
+    def _select_region_relevant_districts(self, region, query, target_district, max_neighbors=3):
         """
-        서울시 구 기준으로 관련성 높은 인접 구를 선택합니다.
+        지역 공통: 검색어와 관련성 높은 인접 지역을 LLM으로 선택합니다.
         """
-        if not target_district or target_district not in SEOUL_DISTRICT_NEIGHBORS:
-            return self._get_seoul_nearby_districts(target_district, max_neighbors)
-        
-        try:
-            prompt = f"""
-사용자가 "{query}"라고 검색했고, 여기서 "{target_district}"를 검색 지역으로 식별했습니다.
-다음 인접 구역 중에서 이 검색어와 가장 관련이 높을 것 같은 구역을 최대 {max_neighbors}개 선택해주세요:
-{SEOUL_DISTRICT_NEIGHBORS[target_district]}
+        neighbors_map = _REGION_NEIGHBORS[region]
+        if not target_district or target_district not in neighbors_map:
+            return self._get_region_nearby_districts(region, target_district, max_neighbors)
 
-### 응답 형식:
-JSON 형식으로 응답해 주세요. 선택한 구 이름만 배열로 제공하세요.
-예시: ["구이름1", "구이름2", "구이름3"]
-"""
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
-            
-            try:
-                neighbors = json.loads(response.text)
-                if isinstance(neighbors, list) and all(isinstance(d, str) for d in neighbors):
-                    valid_neighbors = [d for d in neighbors if d in SEOUL_DISTRICT_NEIGHBORS]
-                    if valid_neighbors:
-                        return [target_district] + valid_neighbors[:max_neighbors]
-            except:
-                pass
-        except Exception as e:
-            print(f"서울 인접 구 선택 중 오류 발생: {str(e)}")
-        
-        return self._get_seoul_nearby_districts(target_district, max_neighbors)
-    
-    def _select_gyeonggi_relevant_districts(self, query, target_district, max_neighbors=3):
-        """
-        경기도 시·군 기준으로 관련성 높은 인접 시·군을 선택합니다.
-        """
-        if not target_district or target_district not in GYEONGGI_DISTRICT_NEIGHBORS:
-            return self._get_gyeonggi_nearby_districts(target_district, max_neighbors)
-        
-        try:
-            prompt = f"""
-사용자가 "{query}"라고 검색했고, 여기서 "{target_district}"를 검색 지역으로 식별했습니다.
-다음 인접 시·군 중에서 이 검색어와 가장 관련이 높을 것 같은 시·군을 최대 {max_neighbors}개 선택해주세요:
-{GYEONGGI_DISTRICT_NEIGHBORS[target_district]}
-
-### 응답 형식:
-JSON 형식으로 응답해 주세요. 선택한 시·군 이름만 배열로 제공하세요.
-예시: ["시군이름1", "시군이름2", "시군이름3"]
-"""
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
-            
-            try:
-                neighbors = json.loads(response.text)
-                if isinstance(neighbors, list) and all(isinstance(d, str) for d in neighbors):
-                    valid_neighbors = [d for d in neighbors if d in GYEONGGI_DISTRICT_NEIGHBORS]
-                    if valid_neighbors:
-                        return [target_district] + valid_neighbors[:max_neighbors]
-            except:
-                pass
-        except Exception as e:
-            print(f"경기도 인접 시·군 선택 중 오류 발생: {str(e)}")
-        
-        return self._get_gyeonggi_nearby_districts(target_district, max_neighbors)
-    
-    def _select_incheon_relevant_districts(self, query, target_district, max_neighbors=3):
-        """
-        인천시 구·군 기준으로 관련성 높은 인접 구·군을 선택합니다.
-        """
-        if not target_district or target_district not in ICH_DISTRICT_NEIGHBORS:
-            return self._get_incheon_nearby_districts(target_district, max_neighbors)
-        
-        # 강화군이나 옹진군처럼 인접 지역이 없는 경우 처리
-        neighbors_list = ICH_DISTRICT_NEIGHBORS[target_district]
+        # 인접 지역이 없는 섬 지역은 기본 인기 지역으로 대체
+        neighbors_list = neighbors_map[target_district]
         if not neighbors_list:
-            # 섬 지역인 경우 다른 주요 구들을 반환
-            return [target_district] + ['남동구', '부평구', '연수구'][:max_neighbors]
-        
+            return [target_district] + list(_REGION_DEFAULT_NEARBY[region])[:max_neighbors]
+
+        # 인접 지역 수가 선택 한도 이하면 LLM이 추려낼 것이 없으므로 호출을 생략
+        if len(neighbors_list) <= max_neighbors:
+            return [target_district] + list(neighbors_list)
+
+        unit, name_unit, example, label = _REGION_PROMPT_CFG[region]
         try:
             prompt = f"""
 사용자가 "{query}"라고 검색했고, 여기서 "{target_district}"를 검색 지역으로 식별했습니다.
-다음 인접 구·군 중에서 이 검색어와 가장 관련이 높을 것 같은 구·군을 최대 {max_neighbors}개 선택해주세요:
+다음 인접 {unit} 중에서 이 검색어와 가장 관련이 높을 것 같은 {unit}을 최대 {max_neighbors}개 선택해주세요:
 {neighbors_list}
 
 ### 응답 형식:
-JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 제공하세요.
-예시: ["구군이름1", "구군이름2", "구군이름3"]
+JSON 형식으로 응답해 주세요. 선택한 {name_unit} 이름만 배열로 제공하세요.
+예시: ["{example}1", "{example}2", "{example}3"]
 """
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
-            
-            try:
-                neighbors = json.loads(response.text)
-                if isinstance(neighbors, list) and all(isinstance(d, str) for d in neighbors):
-                    valid_neighbors = [d for d in neighbors if d in ICH_DISTRICT_NEIGHBORS]
-                    if valid_neighbors:
-                        return [target_district] + valid_neighbors[:max_neighbors]
-            except:
-                pass
-        except Exception as e:
-            print(f"인천 인접 구·군 선택 중 오류 발생: {str(e)}")
-        
-        return self._get_incheon_nearby_districts(target_district, max_neighbors)
-    
-    def _select_busan_relevant_districts(self, query, target_district, max_neighbors=3):
-        """
-        부산시 구·군 기준으로 관련성 높은 인접 구·군을 선택합니다.
-        """
-        if not target_district or target_district not in BUSAN_DISTRICT_NEIGHBORS:
-            return self._get_busan_nearby_districts(target_district, max_neighbors)
-        
-        try:
-            prompt = f"""
-    사용자가 "{query}"라고 검색했고, 여기서 "{target_district}"를 검색 지역으로 식별했습니다.
-    다음 인접 구·군 중에서 이 검색어와 가장 관련이 높을 것 같은 구·군을 최대 {max_neighbors}개 선택해주세요:
-    {BUSAN_DISTRICT_NEIGHBORS[target_district]}
+            response_text = self._cached_generate_content(prompt, config=_DISTRICT_LIST_CONFIG)
 
-    ### 응답 형식:
-    JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 제공하세요.
-    예시: ["구군이름1", "구군이름2", "구군이름3"]
-    """
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
-            
             try:
-                neighbors = json.loads(response.text)
+                neighbors = _loads_json(response_text)
                 if isinstance(neighbors, list) and all(isinstance(d, str) for d in neighbors):
-                    valid_neighbors = [d for d in neighbors if d in BUSAN_DISTRICT_NEIGHBORS]
+                    valid_neighbors = [d for d in neighbors if d in neighbors_map]
                     if valid_neighbors:
                         return [target_district] + valid_neighbors[:max_neighbors]
-            except:
+            except (ValueError, TypeError):
                 pass
         except Exception as e:
-            print(f"부산 인접 구·군 선택 중 오류 발생: {str(e)}")
-        
-        return self._get_busan_nearby_districts(target_district, max_neighbors)
+            logger.warning("%s 선택 중 오류 발생: %s", label, e)
 
+        return self._get_region_nearby_districts(region, target_district, max_neighbors)
 
-    def _select_gyeongbuk_relevant_districts(self, query, target_district, max_neighbors=3):
-        """
-        경상북도 시·군 기준으로 관련성 높은 인접 시·군을 선택합니다.
-        """
-        if not target_district or target_district not in GYEONGBUK_DISTRICT_NEIGHBORS:
-            return self._get_gyeongbuk_nearby_districts(target_district, max_neighbors)
-        
-        # 울릉군처럼 인접 지역이 없는 경우 처리
-        neighbors_list = GYEONGBUK_DISTRICT_NEIGHBORS[target_district]
-        if not neighbors_list:
-            return [target_district] + ['포항시', '경주시', '안동시'][:max_neighbors]
-        
-        try:
-            prompt = f"""
-    사용자가 "{query}"라고 검색했고, 여기서 "{target_district}"를 검색 지역으로 식별했습니다.
-    다음 인접 시·군 중에서 이 검색어와 가장 관련이 높을 것 같은 시·군을 최대 {max_neighbors}개 선택해주세요:
-    {neighbors_list}
-
-    ### 응답 형식:
-    JSON 형식으로 응답해 주세요. 선택한 시·군 이름만 배열로 제공하세요.
-    예시: ["시군이름1", "시군이름2", "시군이름3"]
-    """
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                contents=prompt
-            )
-            
-            try:
-                neighbors = json.loads(response.text)
-                if isinstance(neighbors, list) and all(isinstance(d, str) for d in neighbors):
-                    valid_neighbors = [d for d in neighbors if d in GYEONGBUK_DISTRICT_NEIGHBORS]
-                    if valid_neighbors:
-                        return [target_district] + valid_neighbors[:max_neighbors]
-            except:
-                pass
-        except Exception as e:
-            print(f"경북 인접 시·군 선택 중 오류 발생: {str(e)}")
-        
-        return self._get_gyeongbuk_nearby_districts(target_district, max_neighbors)
-
-    
     def search_pinecone(self, query, namespace, top_k=10, rerank_top_n=8, user_city=None, user_district=None):
         """
         Search Pinecone vector database using the specified namespace.
@@ -1595,8 +2124,14 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
                 "error": "Pinecone index is not initialized"
             }
         
+        # rerank가 최종 개수를 정하므로 검색 깊이는 오버샘플링 계수로 유도
+        effective_top_k = min(
+            _TOP_K_CAP,
+            max(top_k, rerank_top_n * _RERANK_OVERSAMPLE * _MULTIVEC_OVERSAMPLE),
+        )
+        
         try:
-            print(f"Searching Pinecone with namespace: {namespace}")
+            logger.info("Searching Pinecone with namespace: %s", namespace)
             
             # workout이 아닌 경우에만 지역 추출
             target_district_full = self.extract_district_from_query(query, namespace)
@@ -1618,11 +2153,11 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
                     target_district_full = f"경상북도 {user_district}"
                 else:
                     # 네임스페이스와 사용자 위치가 일치하지 않는 경우
-                    print(f"네임스페이스({namespace})와 사용자 위치({user_city})가 일치하지 않음")
+                    logger.info("네임스페이스(%s)와 사용자 위치(%s)가 일치하지 않음", namespace, user_city)
                     target_district_full = None
                 
                 if target_district_full:
-                    print(f"쿼리에서 지역을 찾지 못해 사용자 위치 사용: {target_district_full}")
+                    logger.info("쿼리에서 지역을 찾지 못해 사용자 위치 사용: %s", target_district_full)
             
             # 실제 검색에 사용할 지역명 (구/시/군명만)
             target_district = None
@@ -1636,7 +2171,7 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
             
             # 3. 지역 정보가 없는 경우 처리
             if not target_district:
-                print("지역 정보를 찾을 수 없습니다.")
+                logger.info("지역 정보를 찾을 수 없습니다.")
                 # public_health_center는 지역 정보가 필수
                 if namespace == "public_health_center":
                     return {
@@ -1648,12 +2183,9 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
                     }
                 # 다른 네임스페이스는 지역 정보 없이도 검색 가능 (전체 검색)
                 else:
-                    print(f"{namespace}에서 전체 지역 검색을 수행합니다.")
+                    logger.info("%s에서 전체 지역 검색을 수행합니다.", namespace)
             
-            try:
-                print(f"추출된 지역: {target_district if target_district else 'None (전체 검색)'}")
-            except UnicodeEncodeError:
-                print("추출된 지역: [encoding error]")
+            logger.info("추출된 지역: %s", target_district if target_district else 'None (전체 검색)')
 
             if namespace == "workout":
                 return self.search_workout_videos(query, top_k)
@@ -1661,40 +2193,29 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
             # public_health_center의 경우 특별 처리
             if namespace == "public_health_center":
                 # public_health_center는 전체 주소 형식 사용
-                print(f"보건소 검색 - 대상 지역: {target_district_full}")
+                logger.info("보건소 검색 - 대상 지역: %s", target_district_full)
                 
                 search_params = {
                     "inputs": {"text": query},
-                    "top_k": top_k,
+                    "top_k": effective_top_k,
                     "filter": {"Category": target_district_full}  # 전체 주소 사용
                 }
                 
-                # rerank 없이 먼저 시도
-                try:
-                    search_result = self.dense_index.search(
-                        namespace=namespace,
-                        query=search_params,
-                        fields=["Title", "Category", "chunk_text"],
-                        rerank={
-                            "model": "bge-reranker-v2-m3",
-                            "top_n": rerank_top_n,
-                            "rank_fields": ["chunk_text"]
-                        },
-                    )
-                except Exception as rerank_error:
-                    if "maximum token limit" in str(rerank_error):
-                        print("토큰 제한 초과. rerank 없이 재시도...")
-                        search_result = self.dense_index.search(
-                            namespace=namespace,
-                            query=search_params,
-                            fields=["Title", "Category", "chunk_text"]
-                        )
-                    else:
-                        raise rerank_error
+                # rerank 실패 대비 일반 검색을 병렬로 수행
+                search_result = self._search_with_rerank(
+                    namespace=namespace,
+                    search_params=search_params,
+                    fields=["Title", "Category", "chunk_text"],
+                    rerank={
+                        "model": "bge-reranker-v2-m3",
+                        "top_n": rerank_top_n,
+                        "rank_fields": ["chunk_text"]
+                    },
+                )
                 
                 if search_result and 'result' in search_result and 'hits' in search_result['result']:
                     hits = search_result['result']['hits']
-                    print(f"보건소 검색 결과: {len(hits)}개")
+                    logger.info("보건소 검색 결과: %s개", len(hits))
                     
                     # 검색 정보
                     search_info = {
@@ -1722,164 +2243,147 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
                     }
             
             # 일반 네임스페이스 처리
-            # 대상 지역과 인접 지역 목록 가져오기
+            # 인접 지역 선택(LLM)은 1단계 검색과 데이터 의존성이 없으므로 병렬로 시작해
+            # 검색 RPC 뒤로 LLM 왕복을 숨긴다
+            neighbors_future = None
+            districts_to_search = []
             if target_district:
-                districts_to_search = self.select_relevant_nearby_districts(query, target_district, namespace, max_neighbors=3)
-            else:
-                districts_to_search = []
-            
-            try:
-                districts_str = ', '.join(districts_to_search) if districts_to_search else 'None'
-                print(f"검색할 지역 목록: [{districts_str}]")
-            except UnicodeEncodeError:
-                print("검색할 지역 목록: [encoding error]")
+                neighbors_future = _LLM_EXECUTOR.submit(
+                    self.select_relevant_nearby_districts, query, target_district, namespace, 3
+                )
             
             # 1단계: 추출된 지역만으로 우선 검색 (지역이 있는 경우)
             all_results = []
             searched_districts = []
             
             if target_district:
-                print(f"\n🔍 1단계: {target_district}에서 우선 검색...")  # 구/시/군명만 출력
+                logger.info("\n🔍 1단계: %s에서 우선 검색...", target_district)  # 구/시/군명만 출력
                 
                 search_params = {
                     "inputs": {"text": query},
-                    "top_k": top_k,
+                    "top_k": effective_top_k,
                     "filter": {"Category": target_district}  # 구/시/군명만 사용
                 }
                 
-                # rerank 시도, 실패하면 rerank 없이
+                # rerank는 단계별로 따로 하지 않고 합친 결과에 한 번만 수행
+                first_search = self.dense_index.search(
+                    namespace=namespace,
+                    query=search_params,
+                    fields=["Title", "Category", "chunk_text"],
+                )
+
+                # 1단계 검색과 겹쳐 실행된 인접 지역 목록에 합류
+                # 풀 포화 등으로 제때 끝나지 않으면 정적 인접 목록으로 대체 (무한 대기 방지)
                 try:
-                    first_search = self.dense_index.search(
-                        namespace=namespace,
-                        query=search_params,
-                        fields=["Title", "Category", "chunk_text"],
-                        rerank={
-                            "model": "bge-reranker-v2-m3",
-                            "top_n": rerank_top_n,
-                            "rank_fields": ["chunk_text"]
-                        },
-                    )
-                except Exception as rerank_error:
-                    if "maximum token limit" in str(rerank_error):
-                        print("토큰 제한 초과. rerank 없이 재시도...")
-                        first_search = self.dense_index.search(
-                            namespace=namespace,
-                            query=search_params,
-                            fields=["Title", "Category", "chunk_text"]
-                        )
-                    else:
-                        raise rerank_error
+                    districts_to_search = neighbors_future.result(timeout=_NEIGHBOR_LLM_TIMEOUT)
+                except FuturesTimeout:
+                    neighbors_future.cancel()
+                    logger.warning("인접 지역 선택이 시간 내에 끝나지 않아 정적 인접 목록 사용")
+                    districts_to_search = self.get_nearby_districts(target_district, namespace, 3)
+                districts_str = ', '.join(districts_to_search) if districts_to_search else 'None'
+                logger.info("검색할 지역 목록: [%s]", districts_str)
                 
                 if first_search and 'result' in first_search and 'hits' in first_search['result']:
                     first_hits = first_search['result']['hits']
                     all_results.extend(first_hits)
                     searched_districts.append(target_district)
-                    print(f"✅ {target_district}에서 {len(first_hits)}개 결과 발견")
+                    logger.info("✅ %s에서 %s개 결과 발견", target_district, len(first_hits))
                     
                     # 결과가 8개 이상이면 바로 반환
                     if len(all_results) >= 8:
-                        print(f"📊 충분한 결과 확보 (총 {len(all_results)}개)")
+                        logger.info("📊 충분한 결과 확보 (총 %s개)", len(all_results))
                         return self._format_search_response(
-                            namespace, all_results, target_district, searched_districts, districts_to_search
+                            namespace, self._rerank_hits(query, all_results, rerank_top_n),
+                            target_district, searched_districts, districts_to_search
                         )
             else:
                 # 지역 정보가 없는 경우 전체 검색
-                print(f"\n🔍 전체 지역에서 검색...")
+                logger.info("\n🔍 전체 지역에서 검색...")
                 
                 search_params = {
                     "inputs": {"text": query},
-                    "top_k": top_k
+                    "top_k": effective_top_k
                     # filter 없이 전체 검색
                 }
                 
-                # rerank 시도, 실패하면 rerank 없이
-                try:
-                    general_search = self.dense_index.search(
-                        namespace=namespace,
-                        query=search_params,
-                        fields=["Title", "Category", "chunk_text"],
-                        rerank={
-                            "model": "bge-reranker-v2-m3",
-                            "top_n": rerank_top_n,
-                            "rank_fields": ["chunk_text"]
-                        },
-                    )
-                except Exception as rerank_error:
-                    if "maximum token limit" in str(rerank_error):
-                        print("토큰 제한 초과. rerank 없이 재시도...")
-                        general_search = self.dense_index.search(
-                            namespace=namespace,
-                            query=search_params,
-                            fields=["Title", "Category", "chunk_text"]
-                        )
-                    else:
-                        raise rerank_error
+                # rerank 시도, 실패 시 병렬 일반 검색 결과 사용
+                general_search = self._search_with_rerank(
+                    namespace=namespace,
+                    search_params=search_params,
+                    fields=["Title", "Category", "chunk_text"],
+                    rerank={
+                        "model": "bge-reranker-v2-m3",
+                        "top_n": rerank_top_n,
+                        "rank_fields": ["chunk_text"]
+                    },
+                )
                 
                 if general_search and 'result' in general_search and 'hits' in general_search['result']:
                     general_hits = general_search['result']['hits']
                     all_results.extend(general_hits)
                     searched_districts.append("전체")
-                    print(f"✅ 전체 검색에서 {len(general_hits)}개 결과 발견")
-                    
+                    logger.info("✅ 전체 검색에서 %s개 결과 발견", len(general_hits))
+
+                    # rerank 폴백 시에도 호출자가 기대하는 개수 이상을 돌려주지 않는다
                     return self._format_search_response(
-                        namespace, all_results, "전체", ["전체"], []
+                        namespace, all_results[:rerank_top_n], "전체", ["전체"], []
                     )
             
+            # 2단계 전에 같은 (namespace, 지역) 조합의 이전 병합 결과를 먼저 재사용해 본다
+            # (rerank가 현재 쿼리 기준으로 다시 정렬하므로 이전 쿼리의 후보도 안전함)
+            prior_key = (namespace, target_district)
+            if len(all_results) < 8 and target_district and self._prior_hits_cache is not None:
+                prior_hits = _cache_get(self._prior_hits_cache, prior_key)
+                if prior_hits:
+                    seen_ids = {hit.get('_id') for hit in all_results}
+                    cached_extra = [h for h in prior_hits if h.get('_id') not in seen_ids]
+                    if cached_extra and len(all_results) + len(cached_extra) >= 8:
+                        all_results.extend(cached_extra)
+                        logger.info("💾 이전 검색의 인접 지역 결과 %s개 재사용 - 2단계 생략", len(cached_extra))
+            
             # 2단계: 결과가 8개 미만이면 인접 지역에서 추가 검색
-            if len(all_results) < 8 and districts_to_search and target_district:
+            if len(all_results) < 8 and target_district and districts_to_search:
                 remaining_districts = [d for d in districts_to_search if d != target_district]
                 
                 if remaining_districts:
                     needed_results = 8 - len(all_results)
-                    print(f"\n🔍 2단계: 추가 {needed_results}개 결과가 필요함. 인접 지역에서 검색...")
-                    print(f"검색할 인접 지역: {', '.join(remaining_districts)}")
-                    
-                    search_params = {
-                        "inputs": {"text": query},
-                        "top_k": top_k,
-                        "filter": {"Category": {"$in": remaining_districts}}
-                    }
-                    
-                    # rerank 시도, 실패하면 rerank 없이
-                    try:
-                        second_search = self.dense_index.search(
-                            namespace=namespace,
-                            query=search_params,
-                            fields=["Title", "Category", "chunk_text"],
-                            rerank={
-                                "model": "bge-reranker-v2-m3",
-                                "top_n": needed_results,
-                                "rank_fields": ["chunk_text"]
-                            },
-                        )
-                    except Exception as rerank_error:
-                        if "maximum token limit" in str(rerank_error):
-                            print("토큰 제한 초과. rerank 없이 재시도...")
-                            second_search = self.dense_index.search(
-                                namespace=namespace,
-                                query=search_params,
-                                fields=["Title", "Category", "chunk_text"]
-                            )
-                        else:
-                            raise rerank_error
-                    
+                    logger.info("\n🔍 2단계: 추가 %s개 결과가 필요함. 인접 지역에서 검색...", needed_results)
+                    logger.info("검색할 인접 지역: %s", ', '.join(remaining_districts))
+
+                    # 1단계 결과와 합쳐 한 번만 rerank하므로 여기서도 일반 검색만 수행
+                    second_search = self.dense_index.search(
+                        namespace=namespace,
+                        query={
+                            "inputs": {"text": query},
+                            "top_k": effective_top_k,
+                            "filter": {"Category": {"$in": remaining_districts}}
+                        },
+                        fields=["Title", "Category", "chunk_text"],
+                    )
+
                     if second_search and 'result' in second_search and 'hits' in second_search['result']:
                         second_hits = second_search['result']['hits']
-                        all_results.extend(second_hits)
+                        # 같은 문서가 여러 Category로 두 단계에 모두 잡힐 수 있으므로 _id로 중복 제거
+                        seen_ids = {hit.get('_id') for hit in all_results}
+                        unique_hits = [hit for hit in second_hits if hit.get('_id') not in seen_ids]
+                        all_results.extend(unique_hits)
                         searched_districts.extend(remaining_districts)
-                        print(f"✅ 인접 지역에서 {len(second_hits)}개 추가 결과 발견")
+                        logger.info("✅ 인접 지역에서 %s개 추가 결과 발견", len(unique_hits))
+            
+            # 다음 동일 지역 쿼리를 위해 병합 결과를 저장 (rerank 전 전체 후보 기준)
+            if target_district and all_results and self._prior_hits_cache is not None:
+                _cache_put(self._prior_hits_cache, prior_key, list(all_results))
             
-            # 최종 결과 반환
-            print(f"\n📊 최종 검색 결과: 총 {len(all_results)}개")
+            # 최종 결과 반환: 합쳐진 결과를 한 번만 rerank
+            if target_district and all_results:
+                all_results = self._rerank_hits(query, all_results, rerank_top_n)
+            logger.info("\n📊 최종 검색 결과: 총 %s개", len(all_results))
             return self._format_search_response(
                 namespace, all_results, target_district, searched_districts, districts_to_search
             )
             
         except Exception as e:
-            try:
-                print(f"Pinecone search error: {str(e)}")
-            except UnicodeEncodeError:
-                print("Pinecone search error: [encoding error]")
+            logger.error("Pinecone search error: %s", e)
             return {
                 "source": "pinecone",
                 "namespace": namespace,
@@ -1894,19 +2398,10 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
         """
         검색 결과를 포맷팅하여 반환합니다.
         """
-        # 지역 타입 판별
-        if self.is_seoul_namespace(namespace):
-            region_type = "seoul"
-        elif self.is_gyeonggi_namespace(namespace):
-            region_type = "gyeonggi"
-        elif self.is_incheon_namespace(namespace):
-            region_type = "incheon"
-        elif self.is_busan_namespace(namespace):
-            region_type = "busan"
-        elif self.is_gyeongbuk_namespace(namespace):
-            region_type = "gyeongbuk"
-        else:
-            region_type = "other"
+        # 지역 타입 판별 - 접두어 → 지역 키 테이블로 O(1) 조회 (응답마다 5개 메서드 호출 제거)
+        region_type = "other"
+        if namespace:
+            region_type = _NS_PREFIX_TO_REGION.get(namespace.split('_', 1)[0], "other")
         
         # 검색 정보
         search_info = {
@@ -1916,52 +2411,11 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
             "region_type": region_type
         }
         
-        # 상세한 검색 결과 출력
-        if hits:
-            result_count = len(hits)
-            districts_str = ', '.join(searched_districts) if searched_districts else 'None'
-            
-            print(f"\n{'='*60}")
-            print(f"🔍 검색 결과: 총 {result_count}개 항목")
-            print(f"📍 대상 지역: {target_district if target_district else 'None'}")
-            print(f"📂 네임스페이스: {namespace}")
-            print(f"🏘️ 실제 검색된 지역: {districts_str}")
-            print(f"{'='*60}\n")
-            
-            # 각 검색 결과 상세 출력
-            for idx, hit in enumerate(hits, 1):
-                try:
-                    print(f"--- 결과 #{idx} ---")
-                    print(f"ID: {hit.get('_id', 'N/A')}")
-                    print(f"Score: {hit.get('_score', 0):.4f}")
-                    
-                    if 'fields' in hit:
-                        fields = hit['fields']
-                        title = fields.get('Title', 'N/A')
-                        category = fields.get('Category', 'N/A')
-                        chunk_text = fields.get('chunk_text', 'N/A')
-                        
-                        # 제목과 카테고리 출력
-                        print(f"제목: {title}")
-                        print(f"카테고리: {category}")
-                        
-                        # chunk_text 요약 출력 (처음 200자)
-                        if chunk_text and chunk_text != 'N/A':
-                            preview = chunk_text[:200] + "..." if len(chunk_text) > 200 else chunk_text
-                            print(f"내용 미리보기: {preview}")
-                    
-                    print("")  # 빈 줄로 구분
-                    
-                except UnicodeEncodeError:
-                    print(f"--- 결과 #{idx} --- [인코딩 오류로 출력 불가]")
-                except Exception as e:
-                    print(f"--- 결과 #{idx} --- 출력 중 오류: {str(e)}")
-            
-            print(f"{'='*60}\n")
-        else:
-            print(f"\n⚠️ 검색 결과가 없습니다.")
-            print(f"네임스페이스: {namespace}")
-            print(f"검색된 지역: {', '.join(searched_districts) if searched_districts else 'None'}\n")
+        # 상세한 검색 결과 덤프 (FLASK_PINECONE_DEBUG=1일 때만, 한 번의 print로 출력)
+        if _PINECONE_DEBUG:
+            self._dump_search_results(namespace, hits, target_district, searched_districts)
+        elif not hits:
+            logger.info("⚠️ 검색 결과가 없습니다. (namespace=%s)", namespace)
         
         # 검색 결과 구조 생성
         ranked_results = {
@@ -1978,6 +2432,43 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
             "search_info": search_info
         }
         
+
+    def _dump_search_results(self, namespace, hits, target_district, searched_districts):
+        """
+        검색 결과 상세를 하나의 문자열로 모아 한 번만 출력합니다. (디버그 전용)
+        """
+        districts_str = ', '.join(searched_districts) if searched_districts else 'None'
+        if not hits:
+            logger.info("\n⚠️ 검색 결과가 없습니다.\n네임스페이스: %s\n검색된 지역: %s\n", namespace, districts_str)
+            return
+
+        lines = [
+            "",
+            "=" * 60,
+            f"🔍 검색 결과: 총 {len(hits)}개 항목",
+            f"📍 대상 지역: {target_district if target_district else 'None'}",
+            f"📂 네임스페이스: {namespace}",
+            f"🏘️ 실제 검색된 지역: {districts_str}",
+            "=" * 60,
+            "",
+        ]
+        for idx, hit in enumerate(hits, 1):
+            lines.append(f"--- 결과 #{idx} ---")
+            lines.append(f"ID: {hit.get('_id', 'N/A')}")
+            lines.append(f"Score: {hit.get('_score', 0):.4f}")
+            if 'fields' in hit:
+                fields = hit['fields']
+                lines.append(f"제목: {fields.get('Title', 'N/A')}")
+                lines.append(f"카테고리: {fields.get('Category', 'N/A')}")
+                chunk_text = fields.get('chunk_text', 'N/A')
+                if chunk_text and chunk_text != 'N/A':
+                    preview = chunk_text[:200] + "..." if len(chunk_text) > 200 else chunk_text
+                    lines.append(f"내용 미리보기: {preview}")
+            lines.append("")
+        lines.append("=" * 60)
+        lines.append("")
+        logger.info("%s", "\n".join(lines))
+
     def process_query(self, query, user_city=None, user_district=None):
         """
         Process a user query through the complete pipeline:
@@ -1986,18 +2477,21 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
         3. Query Pinecone or use LLM based on namespace
         """
         
-        # Step 1: 쿼리에 지역명이 있는지 먼저 판단
+        # Step 1: 지역명 유무 판단과 지역 추출을 병렬로 실행
+        # 두 호출은 서로 독립적인 LLM 왕복이므로 동시에 시작하고,
+        # 지역 추출 결과는 지역명이 있는 것으로 판단된 경우에만 사용한다
+        location_future = _LLM_EXECUTOR.submit(self._extract_unified_district, query)
         has_location, detected_location = self.check_location_in_query(query)
-        
+
         print(f"지역명 포함 여부: {has_location}")
         if detected_location:
             print(f"감지된 지역: {detected_location}")
-        
+
         # Step 2: 지역명 유무에 따라 다른 처리
         if has_location:
             # 지역명이 있는 경우 - 지역 추출 후 지역 기반 namespace 선택
-            extracted_location = self._extract_unified_district(query)
-            
+            extracted_location = location_future.result()
+
             if extracted_location:
                 # 지역 기반 namespace 선택
                 namespace_result = self.select_namespace_with_location(query, extracted_location)
@@ -2006,6 +2500,9 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
                 namespace_result = self.select_namespace(query)
         else:
             # 지역명이 없는 경우 - 키워드 기반 namespace 선택
+            # 병렬로 시작해 둔 지역 추출은 결과를 쓰지 않으므로 시작 전이면 취소해
+            # 풀 슬롯과 불필요한 Gemini 호출을 아낀다 (이미 실행 중이면 그대로 끝남)
+            location_future.cancel()
             namespace_result = self.select_namespace_without_location(query)
             extracted_location = None
         
@@ -2037,12 +2534,20 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
             # Query Pinecone
             print(f"Using namespace '{selected_namespace}' for Pinecone search")
             
-            response = self.search_pinecone(
-                query=query, 
-                namespace=selected_namespace,
-                user_city=user_city,
-                user_district=user_district
-            )
+            # 확신도가 낮고 2순위 네임스페이스가 있으면 두 곳을 병렬로 검색해
+            # 쓸 만한 결과가 먼저 나온 쪽을 사용한다 (오선택 시 LLM 폴백 왕복 절약)
+            alternative_namespace = namespace_result.get('alternative_namespace')
+            if alternative_namespace and confidence < 0.7:
+                response = self._search_pinecone_speculative(
+                    query, selected_namespace, alternative_namespace, user_city, user_district
+                )
+            else:
+                response = self.search_pinecone(
+                    query=query, 
+                    namespace=selected_namespace,
+                    user_city=user_city,
+                    user_district=user_district
+                )
             response["debug"] = debug_info
             
             # 결과 확인 및 처리 (기존 코드)
@@ -2062,24 +2567,64 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
             
             return response
 
+    def _search_pinecone_speculative(self, query, primary, secondary, user_city, user_district):
+        """
+        네임스페이스 확신도가 낮을 때 1/2순위 네임스페이스를 병렬로 검색합니다.
+        히트가 있고 최고 점수가 0.5 이상인 응답이 먼저 도착한 쪽을 채택하고,
+        둘 다 기준에 못 미치면 1순위 응답을 반환합니다.
+        """
+        futures = {
+            _SPECULATIVE_EXECUTOR.submit(
+                self.search_pinecone,
+                query=query,
+                namespace=ns,
+                user_city=user_city,
+                user_district=user_district,
+            ): ns
+            for ns in (primary, secondary)
+        }
+        fallback = None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                logger.warning("투기적 네임스페이스 검색 실패(%s): %s", futures[future], e)
+                continue
+            hits = []
+            if response.get("status") == "success":
+                hits = (((response.get("results") or {}).get("result") or {}).get("hits")) or []
+            if hits and max(hit.get('_score', 0) for hit in hits) >= 0.5:
+                for other in futures:
+                    if other is not future:
+                        other.cancel()
+                logger.info("투기적 검색 채택: %s (히트 %s개)", futures[future], len(hits))
+                return response
+            if futures[future] == primary or fallback is None:
+                fallback = response
+        if fallback is not None:
+            return fallback
+        return self.search_pinecone(
+            query=query, namespace=primary, user_city=user_city, user_district=user_district
+        )
+
     def select_namespace_with_location(self, query, extracted_location):
 
         
         """
         추출된 지역 정보를 고려하여 네임스페이스를 선택합니다.
         """
-        # 지역 정보에서 도시 추출
-        if "서울특별시" in extracted_location:
-            city_prefix = "seoul"
-        elif "경기도" in extracted_location:
-            city_prefix = "kk"
-        elif "인천광역시" in extracted_location:
-            city_prefix = "ich"
-        elif "부산광역시" in extracted_location:
-            city_prefix = "bs"
-        elif "경상북도" in extracted_location:
-            city_prefix = "kb"
-        else:
+        # 지역 정보에서 도시 추출: "도시명 구/시/군명" 형식이므로 첫 토큰 O(1) 조회,
+        # 형식이 다른 경우에만 부분 문자열 탐색으로 폴백
+        city_prefix = None
+        if extracted_location:
+            city_prefix = _CITY_TO_NS_PREFIX.get(extracted_location.split(maxsplit=1)[0])
+            if city_prefix is None:
+                city_prefix = next(
+                    (prefix for city, prefix in _CITY_TO_NS_PREFIX.items()
+                     if city in extracted_location),
+                    None,
+                )
+        if city_prefix is None:
             # 지역을 알 수 없는 경우 기존 방식으로 처리
             return self.select_namespace(query)
 
@@ -2102,8 +2647,8 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
         3. facility (시설, 복지관, 요양원)
         
         ### 응답 형식:
-        JSON 형식으로 응답해주세요.
-        예시: {{"category": "culture", "confidence": 0.95, "reasoning": "문화 프로그램을 찾고 있음"}}
+        JSON 형식으로 응답해주세요. alternative에는 두 번째로 가능성이 높은 카테고리를 넣어주세요.
+        예시: {{"category": "culture", "alternative": "facility", "confidence": 0.95, "reasoning": "문화 프로그램을 찾고 있음"}}
         """
         
         try:
@@ -2123,9 +2668,15 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
                     
                     # 네임스페이스가 유효한지 확인
                     if namespace in NAMESPACE_INFO:
+                        # 2순위 카테고리 - 확신도가 낮을 때 투기적 병렬 검색에 사용
+                        alt_category = result.get('alternative')
+                        alternative = f"{city_prefix}_{alt_category}" if alt_category else None
+                        if alternative == namespace or alternative not in NAMESPACE_INFO:
+                            alternative = None
                         return {
                             "namespace": namespace,
                             "confidence": result.get('confidence', 0.8),
+                            "alternative_namespace": alternative,
                             "reasoning": f"{extracted_location}의 {category} 정보를 검색합니다."
                         }
                         
@@ -2162,22 +2713,14 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
         """
         query_lower = query.lower()
         
-        # 운동 관련 키워드 체크
-        workout_keywords = [
-            '운동', '스트레칭', '요가', '필라테스', '홈트', '홈트레이닝',
-            '통증', '재활', '물리치료', '자세교정', '코어',
-            '다이어트', '체중감량', '체지방', '근육', '체력',
-            '허리', '어깨', '목', '무릎', '발목', '손목',
-            '운동법', '운동방법', '운동추천', '운동영상'
-        ]
-        
-        for keyword in workout_keywords:
-            if keyword in query_lower:
-                return {
-                    "namespace": "workout",
-                    "confidence": 0.95,
-                    "reasoning": f"운동 관련 키워드 '{keyword}'가 포함되어 있어 운동 영상을 검색합니다."
-                }
+        # 운동 관련 키워드 체크 (미리 컴파일한 교대 패턴으로 한 번만 스캔)
+        match = _WORKOUT_NS_RE.search(query_lower)
+        if match:
+            return {
+                "namespace": "workout",
+                "confidence": 0.95,
+                "reasoning": f"운동 관련 키워드 '{match.group(0)}'가 포함되어 있어 운동 영상을 검색합니다."
+            }
         
         # # 눈 검사 관련 키워드 체크 (지역명이 없어도 보건소 정보가 필요할 수 있음)
         # eye_health_keywords = [
@@ -2208,18 +2751,7 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
         if not url:
             return None
         
-        # 다양한 YouTube URL 형식 처리
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        return None
+        return _youtube_video_id(url)
 
     def get_youtube_thumbnail_url(self, video_id, quality='hq'):
         """
@@ -2235,45 +2767,162 @@ JSON 형식으로 응답해 주세요. 선택한 구·군 이름만 배열로 
         if not video_id:
             return None
         
-        quality_map = {
-            'maxres': 'maxresdefault',  # 1280x720
-            'hq': 'hqdefault',          # 480x360
-            'mq': 'mqdefault',          # 320x180
-            'sd': 'sddefault',          # 640x480
-            'default': 'default'         # 120x90
-        }
-        
-        quality_suffix = quality_map.get(quality, 'hqdefault')
-        return f"https://img.youtube.com/vi/{video_id}/{quality_suffix}.jpg"
+        return _youtube_thumbnail_url(video_id, quality)
 
 # QueryProcessor 인스턴스 생성
 query_processor = QueryProcessor(gemini_client, pc, dense_index_name)
 
+
+def _build_hit_item(hit):
+    """
+    Pinecone 히트 하나를 응답 항목으로 변환합니다.
+    fields를 한 번만 조회하고 dict 리터럴 하나로 구성합니다.
+    """
+    fields = hit.get('fields') or {}
+    return {
+        "id": hit.get('_id', ''),
+        "score": hit.get('_score', 0),
+        "title": fields.get('Title', _LBL_NA),
+        "category": fields.get('Category', _LBL_NA),
+        "content": fields.get('chunk_text', _LBL_NA),
+    }
+
+
+def _truncate(text, limit=200):
+    """limit 이하의 텍스트는 그대로 반환하고, 넘을 때만 잘라서 말줄임표를 붙입니다."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _build_workout_item(hit):
+    """
+    운동 영상 히트를 응답 항목으로 변환합니다. (URL 파싱/썸네일 포함)
+    """
+    fields = hit.get('fields') or {}
+    url = fields.get('Url', '')
+    category = fields.get('Category', _LBL_NA)
+    video_id = query_processor.extract_youtube_video_id(url)
+    return {
+        "id": hit.get('_id', ''),
+        "score": hit.get('_score', 0),
+        "title": fields.get('Title', _LBL_NA),
+        "category": category,
+        "url": url,
+        "video_id": video_id,
+        "thumbnail_url": query_processor.get_youtube_thumbnail_url(video_id, 'hq') if video_id else None,
+        "content": f"카테고리: {category} | 영상 URL: {url}",
+    }
+
+# 이 개수를 넘는 검색 결과는 한 번에 직렬화하지 않고 스트리밍으로 반환
+_STREAM_HITS_THRESHOLD = 50
+
+
+def _stream_results_response(query, results, extra=None):
+    """
+    검색 결과가 많은 경우 전체 응답을 메모리에 직렬화하지 않고
+    항목 단위로 스트리밍합니다. (orjson 필요)
+    """
+    def stream():
+        yield b'{"query":' + orjson.dumps(query) + b',"results":['
+        first = True
+        for item in results:
+            if not first:
+                yield b','
+            first = False
+            yield orjson.dumps(item)
+        yield b']'
+        if extra:
+            for key, value in extra.items():
+                yield b',' + orjson.dumps(key) + b':' + orjson.dumps(value)
+        yield b'}'
+
+    return Response(stream(), mimetype='application/json')
+
+
 @app.route('/query', methods=['POST'])
 def query_endpoint():
-    try:
-        # JSON 요청에서 query, userCity, userDistrict 데이터 추출
-        data = request.get_json()
-        
-        if not data or 'query' not in data:
-            return jsonify({"error": "Query parameter is required"}), 400
-        
-        query = data['query']
-        user_city = data.get('userCity', '')
-        user_district = data.get('userDistrict', '')
-        
-        # UTF-8 안전 출력
+    # JSON 요청에서 query, userCity, userDistrict 데이터 추출
+    data = request.get_json(silent=True)
+
+    if not data or 'query' not in data:
+        return jsonify({"error": "Query parameter is required"}), 400
+
+    query = data['query']
+    user_city = data.get('userCity', '')
+    user_district = data.get('userDistrict', '')
+
+    # 동일 질문이 반복되면 저장된 응답 바이트를 그대로 반환
+    cache_key = None
+    if _QUERY_CACHE is not None:
+        cache_key = (query.strip().lower(), user_city, user_district)
+        cached = _cache_get(_QUERY_CACHE, cache_key)
+        if cached is not None:
+            logger.info("쿼리 응답 캐시 적중")
+            return Response(cached, mimetype='application/json')
+
+    # 같은 키의 요청이 이미 처리 중이면 새로 처리하지 않고 그 결과를 공유
+    inflight = None
+    is_owner = False
+    if cache_key is not None:
+        with _QUERY_INFLIGHT_LOCK:
+            inflight = _QUERY_INFLIGHT.get(cache_key)
+            if inflight is None:
+                inflight = Future()
+                _QUERY_INFLIGHT[cache_key] = inflight
+                is_owner = True
+    if inflight is not None and not is_owner:
+        logger.info("동일 질문 처리 중 - 진행 중인 응답 공유")
         try:
-            print(f"받은 질문: {query}")
-            print(f"전체 요청 데이터: {data}") 
-            if user_city or user_district:
-                print(f"사용자 위치: {user_city} {user_district}")
-        except UnicodeEncodeError:
-            print("받은 질문: [encoding error]")
+            shared = inflight.result(timeout=_QUERY_INFLIGHT_TIMEOUT)
+            # None은 소유자 응답을 재사용할 수 없다는 표식(스트리밍 응답 등)
+            if shared is not None:
+                body, status = shared
+                return Response(body, status=status, mimetype='application/json')
+        except FuturesTimeout:
+            # 소유자 요청이 지연되면 무한정 기다리지 않고 직접 처리로 전환
+            logger.warning("공유 응답 대기 시간 초과 - 직접 처리로 전환")
+
+    try:
+        response = _handle_query(query, user_city, user_district)
+    except BaseException as e:
+        if is_owner:
+            with _QUERY_INFLIGHT_LOCK:
+                _QUERY_INFLIGHT.pop(cache_key, None)
+            inflight.set_exception(e)
+        raise
+
+    # 스트리밍 응답은 get_data()로 본문을 메모리에 모으는 순간 스트리밍의 의미가
+    # 사라지므로 캐시/공유 대상에서 제외하고 그대로 내보낸다
+    reusable = isinstance(response, Response) and not response.is_streamed
+    if reusable:
+        # passthrough 모드에서는 get_data()가 금지되므로 본문 재사용 전에 해제
+        # (본문이 이미 단일 바이트 객체라 일반 전송 경로 비용은 무시할 수준)
+        response.direct_passthrough = False
+
+    # 정상 처리된 응답만 캐시에 저장
+    if cache_key is not None and reusable and response.status_code == 200:
+        _cache_put(_QUERY_CACHE, cache_key, response.get_data())
+
+    if is_owner:
+        with _QUERY_INFLIGHT_LOCK:
+            _QUERY_INFLIGHT.pop(cache_key, None)
+        if reusable:
+            inflight.set_result((response.get_data(), response.status_code))
+        else:
+            # 본문을 재사용할 수 없는 응답(스트리밍 등)은 대기자들이 직접 처리
+            inflight.set_result(None)
+
+    return response
+
+
+def _handle_query(query, user_city, user_district):
+    try:
+        logger.info("받은 질문: %s", query)
+        if user_city or user_district:
+            logger.info("사용자 위치: %s %s", user_city, user_district)
         
         # Pinecone 및 Gemini가 초기화되지 않은 경우 더미 데이터 반환
         if pc is None or gemini_client is None:
-            return jsonify({
+            return _json({
                 "query": query,
                 "results": [{
                     "id": "test-id-1",
@@ -2284,33 +2933,13 @@ def query_endpoint():
                 }]
             })
         
-        # 체육 시설 이용료 소득 공제 확인
-        sports_deduction_keywords = [
-            ['체육', '시설', '소득', '공제'],
-            ['운동', '시설', '소득', '공제'],
-            ['스포츠', '시설', '소득', '공제'],
-            ['체육', '이용료', '공제'],
-            ['운동', '이용료', '공제'],
-            ['헬스장', '소득', '공제'],
-            ['헬스장', '세금', '공제'],
-            ['체육시설', '세금', '공제'],
-            ['운동', '세금', '공제'],
-            ['피트니스', '소득', '공제'],
-            ['체육시설', '소득공제'],
-            ['운동시설', '소득공제']
-        ]
-        
-        # 각 키워드 조합이 모두 포함되어 있는지 확인
-        is_sports_deduction_query = False
-        for keyword_set in sports_deduction_keywords:
-            if all(keyword in query for keyword in keyword_set):
-                is_sports_deduction_query = True
-                break
+        # 체육 시설 소득공제 / 응급안전안심 여부를 한 번의 키워드 스캔으로 판별
+        is_sports_deduction_query, is_emergency_query = _route_keyword_flags(query)
         
         # 체육 시설 소득 공제 관련 질문인 경우 즉시 응답
         if is_sports_deduction_query:
             print("체육 시설 이용료 소득 공제 관련 질문 감지")
-            return jsonify({
+            return _json({
                 "query": query,
                 "results": [{
                     "id": "sports-deduction-info",
@@ -2323,10 +2952,6 @@ def query_endpoint():
                 "Query_Category": "체육시설 소득공제"
             })
 
-        # 응급안전안심 서비스 확인
-        emergency_keywords = ['응급안전안심', '응급안전', '안심서비스', '독거노인안전', '응급호출', '응급 안전 안심']
-        is_emergency_query = any(keyword in query for keyword in emergency_keywords)
-        
 # /query 엔드포인트의 응급안전안심 처리 부분
         if is_emergency_query:
             print("응급안전안심 서비스 검색 감지")
@@ -2354,26 +2979,25 @@ def query_endpoint():
             
             # 위치 정보가 없는 경우 에러 반환
             if not sido or not sigungu:
-                return jsonify({
+                return _json({
                     "query": query,
                     "results": [{
                         "id": "error",
                         "score": 0,
                         "title": "위치 정보 필요",
-                        "category": "오류",
+                        "category": _LBL_ERROR,
                         "content": "응급안전안심서비스 검색을 위해서는 지역 정보가 필요합니다. 예: '성북구 응급안전안심 서비스'"
                     }],
                     "namespace": "emergency_service"
                 })
             
-            # EmergencyServiceHandler 인스턴스 생성 및 API 호출
+            # 모듈 시작 시 생성해 둔 핸들러로 API 호출 (세션/커넥션 재사용)
             try:
-                from emergency_contact import EmergencyServiceHandler
-                emergency_handler = EmergencyServiceHandler()
-                print("EmergencyServiceHandler 인스턴스 생성 완료")
+                if _emergency_handler is None:
+                    raise RuntimeError("emergency_contact 모듈이 로드되지 않았습니다.")
                 
                 # 응급안전안심 서비스 검색
-                result = emergency_handler.search_emergency_service(sido, sigungu)
+                result = _emergency_handler.search_emergency_service(sido, sigungu)
                 print(f"API 호출 결과 타입: {type(result)}")
                 
                 # result가 None인지 확인
@@ -2388,9 +3012,7 @@ def query_endpoint():
                     print(f"API 호출 결과: {result}")
                     
             except Exception as e:
-                print(f"API 호출 중 예외 발생: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("API 호출 중 예외 발생")
                 result = {
                     "status": "error",
                     "error": f"API 호출 중 오류: {str(e)}",
@@ -2400,55 +3022,56 @@ def query_endpoint():
             # 결과 포맷팅 - 이제 result는 None이 아님
             if result.get("status") == "success":
                 if result.get("results") and len(result["results"]) > 0:
-                    # 성공적으로 결과를 받은 경우
-                    formatted_results = []
-                    for idx, item in enumerate(result["results"]):
-                        formatted_result = {
+                    # 성공적으로 결과를 받은 경우 (지역 문자열은 한 번만 구성)
+                    location_str = f"{result['location']['sido']} {result['location']['sigungu']}"
+                    formatted_results = [
+                        {
                             "id": f"emergency-{idx}",
                             "score": 1.0,
                             "title": item.get("organNm", "기관명 없음"),
-                            "category": f"{result['location']['sido']} {result['location']['sigungu']}",
-                            "content": 
-                                    f"기관명: {item.get('organNm', '정보 없음')}\n" +
-                                    f"주소: {item.get('organAddr', '정보 없음')}\n" +
-                                    f"전화: {item.get('organTel', '정보 없음')}\n" +
-                                    f"이메일: {item.get('organEmail', '정보 없음')}\n"
-                                    # f"사업유형: {item.get('bzType', '정보 없음')}\n" +
-                                    # f"기관유형: {item.get('organType', '정보 없음')}"
+                            "category": location_str,
+                            "content": _EMERGENCY_CONTENT_TMPL.format(
+                                item.get('organNm', '정보 없음'),
+                                item.get('organAddr', '정보 없음'),
+                                item.get('organTel', '정보 없음'),
+                                item.get('organEmail', '정보 없음'),
+                            ),
                         }
-                        formatted_results.append(formatted_result)
+                        for idx, item in enumerate(result["results"])
+                    ]
                     
-                    return jsonify({
+                    return _json({
                         "query": query,
                         "results": formatted_results,
                         "namespace": "emergency_service",
-                        "location_filter": f"{result['location']['sido']} {result['location']['sigungu']}",
+                        "location_filter": location_str,
                         "total_count": result.get("total_count", len(formatted_results))
                     })
                 else:
                     # 결과가 없는 경우
                     location_info = result.get('location', {})
-                    return jsonify({
+                    location_str = f"{location_info.get('sido', '')} {location_info.get('sigungu', '')}"
+                    return _json({
                         "query": query,
                         "results": [{
                             "id": "no-result",
                             "score": 0,
-                            "title": "검색 결과 없음",
-                            "category": f"{location_info.get('sido', '')} {location_info.get('sigungu', '')}",
+                            "title": _LBL_NO_RESULT,
+                            "category": location_str,
                             "content": result.get("message", "해당 지역에 등록된 응급안전안심서비스 기관이 없습니다.")
                         }],
                         "namespace": "emergency_service",
-                        "location_filter": f"{location_info.get('sido', '')} {location_info.get('sigungu', '')}"
+                        "location_filter": location_str
                     })
             else:
                 # 오류가 발생한 경우
-                return jsonify({
+                return _json({
                     "query": query,
                     "results": [{
                         "id": "error",
                         "score": 0,
-                        "title": "검색 오류",
-                        "category": "오류",
+                        "title": _LBL_SEARCH_ERROR,
+                        "category": _LBL_ERROR,
                         "content": result.get("error", "응급안전안심서비스 검색 중 오류가 발생했습니다.")
                     }],
                     "namespace": "emergency_service"
@@ -2457,13 +3080,11 @@ def query_endpoint():
         # QueryProcessor를 통해 쿼리 처리 - 사용자 위치 정보 전달
         result = query_processor.process_query(query, user_city, user_district)
         
-        # namespace 결정 - debug 정보에서 가져오기
-        selected_namespace = None
-        if "debug" in result and "namespace_selection" in result["debug"]:
-            selected_namespace = result["debug"]["namespace_selection"].get("selected")
+        # namespace 결정 - debug 정보에서 가져오기 (.get 체인으로 중간 dict 재조회 제거)
+        selected_namespace = result.get("debug", {}).get("namespace_selection", {}).get("selected")
         
         # namespace가 None인 경우 "LLM"으로 설정
-        final_namespace = "LLM" if selected_namespace is None else selected_namespace
+        final_namespace = selected_namespace or "LLM"
         
         # public_health_center 네임스페이스인 경우 특별 처리
         if selected_namespace == "public_health_center":
@@ -2474,49 +3095,31 @@ def query_endpoint():
                 if result.get("results") and "result" in result["results"]:
                     hits = result["results"]["result"].get("hits", [])
                     
+                    # 검색된 지역 정보는 두 경로 모두 사용하므로 한 번만 조회
+                    search_info = result.get("search_info") or {}
+                    target_district = search_info.get("target_district", "")
+                    
                     if hits:
                         # 검색 결과가 있는 경우
-                        for hit in hits:
-                            item = {
-                                "id": hit.get('_id', ''),
-                                "score": hit.get('_score', 0),
-                            }
-                            
-                            # 필드 정보 추출
-                            if 'fields' in hit:
-                                fields = hit['fields']
-                                item["title"] = fields.get('Title', 'N/A')
-                                item["category"] = fields.get('Category', 'N/A')
-                                item["content"] = fields.get('chunk_text', 'N/A')
-                            
-                            results.append(item)
+                        results = [_build_hit_item(hit) for hit in hits]
                         
-                        # 검색된 지역 정보 포함
-                        location_info = ""
-                        if "search_info" in result:
-                            target_district = result["search_info"].get("target_district", "")
-                            if target_district:
-                                location_info = f"{target_district}의 보건소 정보입니다."
+                        location_info = f"{target_district}의 보건소 정보입니다." if target_district else ""
                         
-                        return jsonify({
+                        return _json({
                             "query": query,
                             "results": results,
                             "namespace": final_namespace,
-                            "location_filter": target_district if "search_info" in result else "",
+                            "location_filter": target_district,
                             "message": location_info
                         })
                     else:
                         # 해당 지역에 결과가 없는 경우
-                        target_district = ""
-                        if "search_info" in result:
-                            target_district = result["search_info"].get("target_district", "")
-                        
-                        return jsonify({
+                        return _json({
                             "query": query,
                             "results": [{
                                 "id": "no-result",
                                 "score": 0,
-                                "title": "검색 결과 없음",
+                                "title": _LBL_NO_RESULT,
                                 "category": target_district,
                                 "content": f"{target_district} 지역의 보건소 정보를 찾을 수 없습니다. 인근 지역 보건소를 방문하시거나 지역 보건소에 직접 문의해주세요."
                             }],
@@ -2526,13 +3129,13 @@ def query_endpoint():
                 
                 # 오류가 발생한 경우
                 elif result["status"] == "error":
-                    return jsonify({
+                    return _json({
                         "query": query,
                         "results": [{
                             "id": "error",
                             "score": 0,
-                            "title": "검색 오류",
-                            "category": "오류",
+                            "title": _LBL_SEARCH_ERROR,
+                            "category": _LBL_ERROR,
                             "content": result.get('error', '보건소 정보 검색 중 오류가 발생했습니다.')
                         }],
                         "namespace": final_namespace
@@ -2548,33 +3151,10 @@ def query_endpoint():
                     hits = result["results"]["result"].get("hits", [])
                     
                     if hits:
-                        for hit in hits:
-                            item = {
-                                "id": hit.get('_id', ''),
-                                "score": hit.get('_score', 0),
-                            }
-                            
-                            if 'fields' in hit:
-                                fields = hit['fields']
-                                url = fields.get('Url', '')
-                                
-                                # YouTube 비디오 ID 추출 및 썸네일 URL 생성
-                                video_id = query_processor.extract_youtube_video_id(url)
-                                thumbnail_url = None
-                                if video_id:
-                                    thumbnail_url = query_processor.get_youtube_thumbnail_url(video_id, 'hq')
-                                
-                                item["title"] = fields.get('Title', 'N/A')
-                                item["category"] = fields.get('Category', 'N/A')
-                                item["url"] = url
-                                item["video_id"] = video_id
-                                item["thumbnail_url"] = thumbnail_url
-                                item["content"] = f"카테고리: {fields.get('Category', 'N/A')} | 영상 URL: {url}"
-                            
-                            results.append(item)
+                        results = [_build_workout_item(hit) for hit in hits]
                         
                         search_info = result.get("search_info", {})
-                        return jsonify({
+                        return _json({
                             "query": query,
                             "results": results,
                             "namespace": final_namespace,
@@ -2582,12 +3162,12 @@ def query_endpoint():
                             "category": search_info.get("category", "")
                         })
                     else:
-                        return jsonify({
+                        return _json({
                             "query": query,
                             "results": [{
                                 "id": "no-result",
                                 "score": 0,
-                                "title": "검색 결과 없음",
+                                "title": _LBL_NO_RESULT,
                                 "category": "",
                                 "content": "해당하는 운동 영상을 찾을 수 없습니다. 다른 검색어로 시도해보세요.",
                                 "url": "",
@@ -2605,46 +3185,34 @@ def query_endpoint():
                 "results": [{
                     "id": "llm-response",
                     "score": 1.0,
-                    "title": "AI 응답",
-                    "category": "일반 정보",
+                    "title": _LBL_AI_RESPONSE,
+                    "category": _LBL_GENERAL_INFO,
                     "content": result.get('response', '응답 없음')
                 }]
             }
             
             # 디버그 정보 추가 (선택적)
-            if "debug" in result:
-                if "search_info" in result["debug"]:
+            debug_info = result.get("debug")
+            if debug_info:
+                search_info = debug_info.get("search_info")
+                if search_info:
                     response_data["district_info"] = {
-                        "target_district": result["debug"]["search_info"].get("target_district"),
-                        "districts_searched": result["debug"]["search_info"].get("districts_searched", []),
-                        "region_type": result["debug"]["search_info"].get("region_type", "unknown")
+                        "target_district": search_info.get("target_district"),
+                        "districts_searched": search_info.get("districts_searched", []),
+                        "region_type": search_info.get("region_type", "unknown")
                     }
-                
+
                 response_data["namespace"] = final_namespace
-                response_data["confidence"] = result["debug"]["namespace_selection"].get("confidence")
+                response_data["confidence"] = debug_info.get("namespace_selection", {}).get("confidence")
             
-            return jsonify(response_data)
+            return _json(response_data)
         elif result["source"] == "pinecone":
             # Pinecone 결과 처리
             results = []
             
             if result["status"] == "success" and result.get("results") and "result" in result["results"]:
                 hits = result["results"]["result"].get("hits", [])
-                
-                for hit in hits:
-                    item = {
-                        "id": hit.get('_id', ''),
-                        "score": hit.get('_score', 0),
-                    }
-                    
-                    # 필드 정보 추출
-                    if 'fields' in hit:
-                        fields = hit['fields']
-                        item["title"] = fields.get('Title', 'N/A')
-                        item["category"] = fields.get('Category', 'N/A')
-                        item["content"] = fields.get('chunk_text', 'N/A')
-                    
-                    results.append(item)
+                results = [_build_hit_item(hit) for hit in hits]
             
             response_data = {
                 "query": query,
@@ -2652,38 +3220,159 @@ def query_endpoint():
             }
             
             # 디버그 정보 추가 (선택적)
-            if "debug" in result:
-                if "search_info" in result["debug"]:
+            debug_info = result.get("debug")
+            if debug_info:
+                search_info = debug_info.get("search_info")
+                if search_info:
                     response_data["district_info"] = {
-                        "target_district": result["debug"]["search_info"].get("target_district"),
-                        "districts_searched": result["debug"]["search_info"].get("districts_searched", []),
-                        "region_type": result["debug"]["search_info"].get("region_type", "unknown")
+                        "target_district": search_info.get("target_district"),
+                        "districts_searched": search_info.get("districts_searched", []),
+                        "region_type": search_info.get("region_type", "unknown")
                     }
-                
+
                 response_data["namespace"] = final_namespace
-                response_data["confidence"] = result["debug"]["namespace_selection"].get("confidence")
-            
-            return jsonify(response_data)
+                response_data["confidence"] = debug_info.get("namespace_selection", {}).get("confidence")
+
+            # 결과가 많으면 스트리밍으로 반환 (메모리 피크와 첫 바이트 지연 감소)
+            if orjson is not None and len(results) > _STREAM_HITS_THRESHOLD:
+                extra = {k: v for k, v in response_data.items() if k not in ("query", "results")}
+                return _stream_results_response(query, results, extra)
+
+            return _json(response_data)
         else:
             # 기타 결과 형식 처리
-            return jsonify({
+            return _json({
                 "query": query,
                 "error": "Unknown result source",
                 "results": []
             })
             
     except Exception as e:
-        import traceback
-        try:
-            print(f"쿼리 처리 중 오류: {str(e)}")
-            print(traceback.format_exc())
-        except UnicodeEncodeError:
-            print("쿼리 처리 중 오류: [encoding error]")
-        return jsonify({
+        logger.exception("쿼리 처리 중 오류")
+        return _json({
             "query": query if 'query' in locals() else "unknown",
             "error": str(e),
             "results": []
-        }), 500
+        }, 500)
+
+# 같은 (카테고리, 지역) 질문 생성을 위한 Gemini 호출을 묶어서 처리
+# 한 번의 호출로 여러 개의 질문을 받아두고, 이후 요청은 저장된 질문을 돌려가며 재사용
+# (카테고리 × 도시 × 구/군 조합이 유한하므로 키당 Gemini 호출은 최대 한 번)
+_QUESTION_BATCH_SIZE = 5
+_question_stash = {}
+_question_stash_lock = Lock()
+
+
+def _next_generated_question(selected_category, generated_query):
+    """
+    주어진 카테고리/주제에 대한 자연스러운 질문을 반환합니다.
+    Gemini 호출 한 번으로 질문 여러 개를 미리 생성해 두고, 이후에는
+    저장된 질문을 라운드 로빈으로 재사용해 LLM 왕복을 완전히 없앱니다.
+    """
+    key = (selected_category, generated_query)
+    with _question_stash_lock:
+        stash = _question_stash.get(key)
+        if stash:
+            question = stash.pop(0)
+            stash.append(question)
+            return question
+
+    prompt = f"""
+다음 주제에 대해 자연스럽고 구체적인 질문을 {_QUESTION_BATCH_SIZE}개 만들어주세요.
+주제: {generated_query}
+카테고리: {selected_category}
+
+시니어(노인)를 위한 정보를 찾는 질문이어야 합니다.
+
+### 응답 형식:
+JSON 배열로만 응답해주세요. 다른 설명은 하지 마세요.
+예시: ["질문1", "질문2", "질문3"]
+"""
+
+    response = gemini_client.models.generate_content(
+        model="gemini-2.0-flash-lite",
+        contents=prompt
+    )
+
+    questions = None
+    try:
+        questions = json.loads(response.text)
+    except json.JSONDecodeError:
+        json_match = re.search(r'\[.*\]', response.text, re.DOTALL)
+        if json_match:
+            try:
+                questions = json.loads(json_match.group(0))
+            except json.JSONDecodeError:
+                pass
+
+    if isinstance(questions, list):
+        questions = [q.strip() for q in questions if isinstance(q, str) and q.strip()]
+    else:
+        questions = None
+
+    # 배열 파싱에 실패하면 기존처럼 응답 텍스트를 질문 하나로 사용
+    if not questions:
+        return response.text.strip()
+
+    with _question_stash_lock:
+        # 동시에 생성한 다른 스레드가 먼저 저장했으면 그쪽 목록을 사용
+        stash = _question_stash.setdefault(key, questions)
+        question = stash.pop(0)
+        stash.append(question)
+    return question
+
+
+def _explore_multi_query(selected_category, generated_query):
+    """
+    /explore의 multi-query 경로: 자연스러운 질문을 만들고 검색까지 수행해
+    query_response 페이로드를 반환합니다. (백그라운드 스레드에서 실행됨)
+    """
+    # Gemini를 사용하여 더 자연스러운 질문 생성 (배치로 미리 생성해 둔 질문 재사용)
+    actual_llm_query = _next_generated_question(selected_category, generated_query)
+    logger.info("카테고리: %s", selected_category)
+    logger.info("템플릿 질문: %s", generated_query)
+    logger.info("LLM 생성 질문: %s", actual_llm_query)
+
+    # LLM이 생성한 질문을 query_processor로 처리
+    # 질문이 키당 5개로 순환하므로 동일 질문의 검색 결과는 TTL 캐시로 재사용
+    query_result = None
+    explore_cache_key = actual_llm_query.strip().lower()
+    if _EXPLORE_QUERY_CACHE is not None:
+        query_result = _cache_get(_EXPLORE_QUERY_CACHE, explore_cache_key)
+    if query_result is None:
+        query_result = query_processor.process_query(actual_llm_query)
+        # LLM 생성 응답은 매번 달라질 수 있으므로 Pinecone 결과만 저장
+        if _EXPLORE_QUERY_CACHE is not None and query_result.get("source") == "pinecone":
+            _cache_put(_EXPLORE_QUERY_CACHE, explore_cache_key, query_result)
+
+    # 결과 포맷팅
+    if query_result["source"] == "llm":
+        return {
+            "type": "llm",
+            "content": query_result.get("response", "응답 없음"),
+            "category": selected_category  # 카테고리 추가
+        }
+    if query_result["source"] == "pinecone":
+        results = []
+        if query_result["status"] == "success" and query_result.get("results"):
+            if "result" in query_result["results"]:
+                hits = query_result["results"]["result"].get("hits", [])
+                for hit in hits[:3]:  # 상위 3개만
+                    if 'fields' in hit:
+                        fields = hit['fields']
+                        results.append({
+                            "title": fields.get('Title', _LBL_NA),
+                            "category": fields.get('Category', _LBL_NA),
+                            "content": _truncate(fields.get('chunk_text', _LBL_NA))  # 요약
+                        })
+
+        return {
+            "type": "pinecone",
+            "results": results,
+            "category": selected_category
+        }
+    return None
+
 
 @app.route('/explore', methods=['POST'])
 def explore_endpoint():
@@ -2712,132 +3401,46 @@ def explore_endpoint():
                 "query_response": None
             })
         
-        # Multi-query 처리
+        # Multi-query 처리 - LLM/검색 호출은 백그라운드로 시작해 두고
+        # 즉시 계산 가능한 recommendations/nearby_districts를 먼저 구성한다
         generated_query = None
         query_response = None
-        actual_llm_query = None  # LLM이 생성한 실제 질문
+        multi_query_future = None
         
         if user_city and user_district and gemini_client:
-            try:
-                # 랜덤으로 카테고리 선택
-                selected_category = random.choice(list(MULTI_QUERY_CATEGORY.keys()))
-                query_template = MULTI_QUERY_CATEGORY[selected_category]
-                
-                # 템플릿에 실제 위치 정보 채우기 - 이것을 generated_query로 사용
-                generated_query = query_template.format(
-                    user_city=user_city,
-                    user_district=user_district
-                )
-                
-                # Gemini를 사용하여 더 자연스러운 질문 생성
-                prompt = f"""
-다음 주제에 대해 자연스럽고 구체적인 질문을 하나 만들어주세요.
-주제: {generated_query}
-카테고리: {selected_category}
-
-시니어(노인)를 위한 정보를 찾는 질문이어야 합니다.
-질문만 반환하고 다른 설명은 하지 마세요.
-"""
-                
-                response = gemini_client.models.generate_content(
-                model="gemini-2.0-flash-lite",
-                    contents=prompt
-                )
-                
-                actual_llm_query = response.text.strip()
-                print(f"카테고리: {selected_category}")
-                print(f"템플릿 질문: {generated_query}")
-                print(f"LLM 생성 질문: {actual_llm_query}")
-                
-                # LLM이 생성한 질문을 query_processor로 처리
-                query_result = query_processor.process_query(actual_llm_query)
-                
-                # 결과 포맷팅
-                if query_result["source"] == "llm":
-                    query_response = {
-                        "type": "llm",
-                        "content": query_result.get("response", "응답 없음"),
-                        "category": selected_category  # 카테고리 추가
-                    }
-                elif query_result["source"] == "pinecone":
-                    results = []
-                    if query_result["status"] == "success" and query_result.get("results"):
-                        if "result" in query_result["results"]:
-                            hits = query_result["results"]["result"].get("hits", [])
-                            for hit in hits[:3]:  # 상위 3개만
-                                if 'fields' in hit:
-                                    fields = hit['fields']
-                                    results.append({
-                                        "title": fields.get('Title', 'N/A'),
-                                        "category": fields.get('Category', 'N/A'),
-                                        "content": fields.get('chunk_text', 'N/A')[:200] + "..."  # 요약
-                                    })
-                    
-                    query_response = {
-                        "type": "pinecone",
-                        "results": results,
-                        "category": selected_category
-                    }
-                
-            except Exception as e:
-                print(f"Multi-query 처리 중 오류: {str(e)}")
-        
-        # 지역별 추천 검색어 또는 인기 카테고리 생성
-        recommendations = []
-        
-        # 서울시인 경우
-        if user_city == "서울특별시" or "서울" in user_city:
-            recommendations = [
-                f"{user_district} 노인복지관",
-                f"{user_district} 경로당",
-                f"{user_district} 시니어 일자리",
-                f"{user_district} 문화센터 프로그램",
-                f"{user_district} 방문요양센터"
-            ]
-        # 경기도인 경우
-        elif user_city == "경기도" or "경기" in user_city:
-            recommendations = [
-                f"{user_district} 노인복지시설",
-                f"{user_district} 실버 일자리",
-                f"{user_district} 평생교육원",
-                f"{user_district} 주간보호센터",
-                f"{user_district} 노인교실"
-            ]
-        # 인천인 경우
-        elif user_city == "인천광역시" or "인천" in user_city:
-            recommendations = [
-                f"{user_district} 노인복지관",
-                f"{user_district} 시니어클럽",
-                f"{user_district} 문화강좌",
-                f"{user_district} 일자리센터",
-                f"{user_district} 경로당"
-            ]
-        elif user_city == "부산광역시" or "부산" in user_city:
-            recommendations = [
-                f"{user_district} 노인복지관",
-                f"{user_district} 시니어센터",
-                f"{user_district} 평생학습관",
-                f"{user_district} 실버일자리",
-                f"{user_district} 경로식당"
-            ]
-        # 경상북도인 경우
-        elif user_city == "경상북도" or "경북" in user_city:
-            recommendations = [
-                f"{user_district} 노인복지시설",
-                f"{user_district} 시니어클럽",
-                f"{user_district} 문화센터",
-                f"{user_district} 일자리지원센터",
-                f"{user_district} 복지관"
-            ]
+            # 랜덤으로 카테고리 선택
+            selected_category = random.choice(_MULTI_QUERY_CATEGORY_KEYS)
+            query_template = MULTI_QUERY_CATEGORY[selected_category]
+            
+            # 템플릿에 실제 위치 정보 채우기 - 이것을 generated_query로 사용
+            generated_query = query_template.format(
+                user_city=user_city,
+                user_district=user_district
+            )
+            
+            multi_query_future = _EXPLORE_EXECUTOR.submit(
+                _explore_multi_query, selected_category, generated_query
+            )
+        
+        # 지역별 추천 검색어 또는 인기 카테고리 생성 (모듈 템플릿 조회 한 번으로 구성)
+        templates = next(
+            (tmpl for key, tmpl in _RECOMMENDATION_TEMPLATES.items() if key in user_city),
+            None,
+        )
+        if templates is not None:
+            recommendations = [t.format(d=user_district) for t in templates]
         else:
             # 기타 지역
-            recommendations = [
-                "노인복지시설 찾기",
-                "시니어 일자리 정보",
-                "문화 프로그램 안내",
-                "건강 관리 서비스",
-                "여가 활동 정보"
-            ]
+            recommendations = list(_DEFAULT_RECOMMENDATIONS)
+        
+        # 백그라운드 multi-query에 합류 - 제한 시간을 넘기면 부분 응답으로 반환
+        if multi_query_future is not None:
+            try:
+                query_response = multi_query_future.result(timeout=_EXPLORE_LLM_TIMEOUT)
+            except FuturesTimeout:
+                logger.info("Multi-query가 %.1fs 안에 끝나지 않아 부분 응답 반환", _EXPLORE_LLM_TIMEOUT)
+            except Exception as e:
+                logger.warning("Multi-query 처리 중 오류: %s", e)
         
         # 응답 데이터 구성
         response_data = {
@@ -2847,47 +3450,21 @@ def explore_endpoint():
                 "district": user_district
             },
             "recommendations": recommendations,
-            "popular_searches": [
-                "방문요양 서비스",
-                "노인 일자리 채용",
-                "실버 문화강좌",
-                "건강검진 안내",
-                "복지관 프로그램"
-            ],
+            "popular_searches": POPULAR_SEARCHES,
             "nearby_facilities": [],  # 추후 구현 가능
             "generated_query": generated_query,  # 템플릿 질문 (위치 정보가 채워진)
             "query_response": query_response  # 질문에 대한 응답
         }
         
-        # 지역이 명확한 경우 인접 지역 정보도 추가
+        # 지역이 명확한 경우 인접 지역 정보도 추가 (통합 색인 조회 한 번)
         if user_district:
-            if user_district in SEOUL_DISTRICT_NEIGHBORS:
-                response_data["nearby_districts"] = SEOUL_DISTRICT_NEIGHBORS[user_district][:3]
-            elif user_district in GYEONGGI_DISTRICT_NEIGHBORS:
-                response_data["nearby_districts"] = GYEONGGI_DISTRICT_NEIGHBORS[user_district][:3]
-            elif user_district in ICH_DISTRICT_NEIGHBORS:
-                neighbors = ICH_DISTRICT_NEIGHBORS[user_district]
-                if neighbors:
-                    response_data["nearby_districts"] = neighbors[:3]
-                else:
-                    response_data["nearby_districts"] = ['남동구', '부평구', '연수구'][:3]
-            elif user_district in BUSAN_DISTRICT_NEIGHBORS:
-                response_data["nearby_districts"] = BUSAN_DISTRICT_NEIGHBORS[user_district][:3]
-            elif user_district in GYEONGBUK_DISTRICT_NEIGHBORS:
-                neighbors = GYEONGBUK_DISTRICT_NEIGHBORS[user_district]
-                if neighbors:
-                    response_data["nearby_districts"] = neighbors[:3]
-                else:
-                    response_data["nearby_districts"] = ['포항시', '경주시', '안동시'][:3]
+            nearby = _EXPLORE_NEARBY.get(user_district)
+            if nearby is not None:
+                response_data["nearby_districts"] = nearby
         return jsonify(response_data)
         
     except Exception as e:
-        import traceback
-        try:
-            print(f"탐색 처리 중 오류: {str(e)}")
-            print(traceback.format_exc())
-        except UnicodeEncodeError:
-            print("탐색 처리 중 오류: [encoding error]")
+        logger.exception("탐색 처리 중 오류")
         return jsonify({
             "status": "error",
             "error": str(e)
@@ -2905,18 +3482,14 @@ def logiin():
     })
 
 # 서버 상태 확인용 엔드포인트
-@app.route('/health', methods=['GET'])
-def health_check():
-    return jsonify({
-        "status": "ok",
-        "pinecone": "available" if pc is not None else "unavailable",
-        "gemini": "available" if gemini_client is not None else "unavailable"
-    })
-
-# 테스트용 홈 엔드포인트
-@app.route('/', methods=['GET'])
-def home():
-    return """
+# 고정 엔드포인트 응답은 요청마다 직렬화/인코딩하지 않고 시작 시 바이트로 준비
+_HEALTH_JSON_BYTES = json.dumps({
+    "status": "ok",
+    "pinecone": "available" if pc is not None else "unavailable",
+    "gemini": "available" if gemini_client is not None else "unavailable"
+}).encode('utf-8')
+
+_HOME_HTML_BYTES = """
     <html>
     <head>
         <title>지역 기반 통합 검색 서버</title>
@@ -2957,7 +3530,17 @@ def home():
         </div>
     </body>
     </html>
-    """
+    """.encode('utf-8')
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    # pc/gemini 가용성은 프로세스 수명 동안 변하지 않으므로 응답 바이트를 미리 직렬화
+    return Response(_HEALTH_JSON_BYTES, mimetype='application/json')
+
+# 테스트용 홈 엔드포인트
+@app.route('/', methods=['GET'])
+def home():
+    return Response(_HOME_HTML_BYTES, mimetype='text/html; charset=utf-8', direct_passthrough=True)
 
 # 일반 Python 스크립트에서 실행할 때는 이 부분을 사용하세요:
 if __name__ == '__main__':
@@ -2973,10 +3556,13 @@ if __name__ == '__main__':
                 pass
     
     port = int(os.getenv("PORT", 5000))
+    # 운영 환경에서는 디버거/자동 리로더 오버헤드를 피하기 위해 기본값은 debug 비활성화
+    # (디버깅이 필요하면 FLASK_DEBUG=1 로 실행, 실제 배포는 gunicorn_config.py 사용)
+    debug = os.getenv("FLASK_DEBUG", "0") == "1"
     try:
         print(f"지역 기반 통합 검색 서버를 시작합니다. 포트: {port}")
     except UnicodeEncodeError:
         print("Starting integrated search server...")
-    
-    
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+
+
+    app.run(host='0.0.0.0', port=port, debug=debug, threaded=True)
\ No newline at end of file
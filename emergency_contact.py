@@ -1,6 +1,7 @@
 import requests
 import json
 import os
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load .env file
@@ -10,6 +11,11 @@ class EmergencyServiceHandler:
     def __init__(self):
         self.service_key = os.getenv('EMERGENCY_KEY')
         self.base_url = 'http://apis.data.go.kr/1352000/ODMS_EMG_02/callEmg02Api'
+        # 연결을 재사용하는 세션 (호출마다 TCP 핸드셰이크를 다시 하지 않음)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def search_emergency_service(self, sido, sigungu):
         """
@@ -53,7 +59,7 @@ class EmergencyServiceHandler:
             print(f"응급안전안심 서비스 API 호출 - 시도: {sido}, 시군구: {sigungu}")
             
             # API 호출
-            response = requests.get(self.base_url, params=params)
+            response = self.session.get(self.base_url, params=params)
             response.encoding = 'utf-8'
             
             print(f"[DEBUG] API 응답 상태 코드: {response.status_code}")
@@ -1,2 +1,11 @@
 bind = "0.0.0.0:8080"
-workers = 2
\ No newline at end of file
+workers = 2
+
+# 요청 처리 시간 대부분이 Gemini/Pinecone/공공 API 대기(I/O)이므로
+# 동기 워커 대신 스레드 워커를 사용해 대기 중에도 다른 요청을 받는다
+worker_class = "gthread"
+threads = 8
+
+# 마스터 프로세스에서 앱을 먼저 import한 뒤 fork하여
+# 워커마다 dotenv 로드와 Pinecone/Gemini 클라이언트 초기화를 반복하지 않음
+preload_app = True